@@ -0,0 +1,373 @@
+# Minimal HTTP(S) client for Badger 2040 W, used instead of urequests
+# get() does one request on a given socket; Session holds one socket per host
+# so repeat fetches skip the TCP and TLS handshakes
+
+import socket
+import json
+import io
+
+try:
+    import ssl
+except ImportError:
+    import ussl as ssl
+
+try:
+    import select
+except ImportError:
+    import uselect as select
+
+# errno for a non-blocking connect() still in progress (lwIP and Linux)
+EINPROGRESS = 115
+
+# Gzip decoding for compressed bodies: deflate on MicroPython 1.21+, uzlib before that
+try:
+    from deflate import DeflateIO, GZIP
+    
+    def gunzip_stream(stream):
+        return DeflateIO(stream, GZIP)
+except ImportError:
+    try:
+        from uzlib import DecompIO
+        
+        def gunzip_stream(stream):
+            return DecompIO(stream, 31)
+    except ImportError:
+        gunzip_stream = None
+
+USER_AGENT = "BadgerGitHubBadge/1.0"
+
+# Resolved sockaddr per (host, port), so reconnects skip the DNS round trip
+_addrs = {}
+
+
+def split_url(url):
+    """Return (host, port, use_ssl, path) for an http(s) URL"""
+    parts = url.split("/", 3)
+    host = parts[2]
+    path = "/" + (parts[3] if len(parts) > 3 else "")
+    use_ssl = parts[0] == "https:"
+    port = 443 if use_ssl else 80
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+    return host, port, use_ssl, path
+
+
+def resolve(host, port):
+    """Return the sockaddr for host:port, looking it up only the first time"""
+    addr = _addrs.get((host, port))
+    if addr is None:
+        addr = _addrs[(host, port)] = socket.getaddrinfo(host, port)[0][-1]
+    return addr
+
+
+def resolve_url(url):
+    """Resolve url's host ahead of the first request; failures are left for connect time"""
+    host, port, _, _ = split_url(url)
+    try:
+        resolve(host, port)
+    except OSError as e:
+        print(f"DNS lookup for {host} failed: {e}")
+
+
+def forget_addresses():
+    """Drop every cached address, e.g. after Wi-Fi reconnects to a different network"""
+    _addrs.clear()
+
+
+class BodyReader(io.IOBase):
+    """File-like view of one response body that stops at the end of the body
+    
+    Subclassing io.IOBase with readinto() lets native stream wrappers such as
+    DeflateIO read from it directly.
+    """
+    
+    def __init__(self, sock, headers, status):
+        self.sock = sock
+        self._chunked = headers.get("transfer-encoding") == "chunked"
+        if status == 304 or status == 204 or self._chunked:
+            self._left = 0
+        else:
+            # No length and not chunked: the body runs until the server closes (-1)
+            self._left = int(headers.get("content-length", -1))
+        self.to_eof = self._left < 0
+        self.done = not self._chunked and self._left == 0
+    
+    def _available(self):
+        # Bytes left in the current chunk, starting the next chunk if needed; 0 at the end
+        if self.done:
+            return 0
+        if self._left == 0:
+            self._left = int(self.sock.readline().split(b";")[0], 16)
+            if self._left == 0:
+                self.sock.readline()
+                self.done = True
+        return self._left
+    
+    def _consumed(self, n):
+        if self.to_eof:
+            self.done = not n
+            return
+        if not n:
+            raise OSError("connection closed mid-body")
+        self._left -= n
+        if self._left == 0:
+            if self._chunked:
+                self.sock.readline()
+            else:
+                self.done = True
+    
+    def read(self, size=-1):
+        if size < 0:
+            return self.readall()
+        left = self._available()
+        if not left:
+            return b""
+        data = self.sock.read(size if left < 0 else min(size, left))
+        self._consumed(len(data))
+        return data
+    
+    def readinto(self, buf):
+        # Straight from the socket into buf, without an intermediate bytes object
+        left = self._available()
+        if not left:
+            return 0
+        n = self.sock.readinto(buf if left < 0 else memoryview(buf)[:min(len(buf), left)])
+        self._consumed(n)
+        return n
+    
+    def readline(self):
+        # Byte at a time so a keep-alive read never runs past the end of the body
+        line = b""
+        while not line.endswith(b"\n"):
+            data = self.read(1)
+            if not data:
+                break
+            line += data
+        return line
+    
+    def readall(self):
+        parts = []
+        while True:
+            data = self.read(1024)
+            if not data:
+                return b"".join(parts)
+            parts.append(data)
+
+
+def open_connection(host, port, use_tls=True, timeout=10, sock=None):
+    """Connect to host:port, or finish setting up an already connected sock"""
+    if sock is None:
+        sock = socket.socket()
+        sock.settimeout(timeout)
+        try:
+            sock.connect(resolve(host, port))
+        except OSError:
+            # The cached address may be stale; look it up again next time
+            _addrs.pop((host, port), None)
+            sock.close()
+            raise
+    else:
+        sock.settimeout(timeout)
+    if use_tls:
+        sock = ssl.wrap_socket(sock, server_hostname=host)
+    return sock
+
+
+def read_head(sock):
+    """Read the status line and headers; returns (status, headers) with lowercased names"""
+    line = sock.readline()
+    if not line:
+        raise OSError("connection closed")
+    status = int(line.split(None, 2)[1])
+    
+    # HTTP/1.0 servers close the connection after every response
+    headers = {"connection": "close"} if line.startswith(b"HTTP/1.0") else {}
+    while True:
+        line = sock.readline()
+        if not line or line == b"\r\n":
+            break
+        name, value = line.decode().split(":", 1)
+        headers[name.strip().lower()] = value.strip()
+    
+    return status, headers
+
+
+def get(host, port, path, headers=None, use_tls=True, sock=None, timeout=10):
+    """Send one GET for path and read the response head
+    
+    Reuses sock when given (e.g. a keep-alive connection), otherwise opens a
+    new connection. Returns (status, headers, body) where body is a
+    BodyReader over the still-open socket, available as body.sock.
+    """
+    opened = sock is None
+    if opened:
+        sock = open_connection(host, port, use_tls, timeout)
+    
+    all_headers = {"User-Agent": USER_AGENT, "Connection": "keep-alive"}
+    if gunzip_stream:
+        all_headers["Accept-Encoding"] = "gzip"
+    if headers:
+        all_headers.update(headers)
+    authority = host if port in (80, 443) else f"{host}:{port}"
+    request = f"GET {path} HTTP/1.1\r\nHost: {authority}\r\n"
+    for name, value in all_headers.items():
+        request += f"{name}: {value}\r\n"
+    
+    try:
+        sock.write((request + "\r\n").encode())
+        status, resp_headers = read_head(sock)
+    except OSError:
+        if opened:
+            sock.close()
+        raise
+    return status, resp_headers, BodyReader(sock, resp_headers, status)
+
+
+class Response:
+    """Minimal urequests-style response
+    
+    The body is read up front unless the request was made with stream=True,
+    in which case it is read from stream (or raw, still encoded) and close()
+    discards whatever is left.
+    """
+    
+    def __init__(self, status_code, headers, raw, release):
+        self.status_code = status_code
+        self.headers = headers
+        self.raw = raw
+        self._release = release
+        self._content = None
+        
+        # Transparently gunzip when the server compressed the body
+        if gunzip_stream and headers.get("content-encoding") == "gzip":
+            self.stream = gunzip_stream(raw)
+        else:
+            self.stream = raw
+    
+    @property
+    def content(self):
+        if self._content is None:
+            try:
+                self._content = self.stream.read()
+            finally:
+                self.close()
+        return self._content
+    
+    @property
+    def text(self):
+        return self.content.decode()
+    
+    def json(self):
+        return json.loads(self.content)
+    
+    def close(self):
+        # The socket belongs to the session and stays open for the next request
+        if self._release:
+            self._release(self.raw)
+            self._release = None
+
+
+class Session:
+    """Reuse one HTTP/1.1 keep-alive connection per (host, port)"""
+    
+    def __init__(self):
+        self._conns = {}
+        self._pending = {}
+    
+    def preconnect(self, url):
+        """Start a non-blocking TCP connect to url's host and return immediately
+        
+        Call it just before a slow blocking job such as display.update(); the
+        handshake progresses meanwhile and the next get() to that host picks up
+        the socket instead of connecting from scratch.
+        """
+        host, port, _, _ = split_url(url)
+        key = (host, port)
+        if key in self._conns or key in self._pending:
+            return
+        
+        sock = socket.socket()
+        try:
+            addr = resolve(host, port)
+            sock.setblocking(False)
+            try:
+                sock.connect(addr)
+            except OSError as e:
+                if e.args[0] != EINPROGRESS:
+                    raise
+        except OSError as e:
+            print(f"Preconnect failed: {e}")
+            sock.close()
+            return
+        self._pending[key] = sock
+    
+    def _finish_preconnect(self, key, timeout):
+        """Return the preconnected socket for key once writable, or None"""
+        sock = self._pending.pop(key, None)
+        if sock is None:
+            return None
+        
+        poller = select.poll()
+        poller.register(sock, select.POLLOUT)
+        events = poller.poll(int(timeout * 1000))
+        if events and not events[0][1] & (select.POLLERR | select.POLLHUP):
+            return sock
+        sock.close()
+        return None
+    
+    def _drop(self, key):
+        conn = self._conns.pop(key, None)
+        if conn:
+            try:
+                conn.close()
+            except OSError:
+                pass
+    
+    def close(self):
+        """Close every open connection"""
+        for key in list(self._conns):
+            self._drop(key)
+        while self._pending:
+            self._pending.popitem()[1].close()
+    
+    def get(self, url, headers=None, timeout=10, stream=False):
+        """GET url over a pooled connection, reconnecting once if it went stale"""
+        host, port, use_ssl, path = split_url(url)
+        key = (host, port)
+        
+        for attempt in (0, 1):
+            conn = self._conns.get(key)
+            reused = conn is not None
+            if not reused:
+                conn = open_connection(host, port, use_ssl, timeout, self._finish_preconnect(key, timeout))
+                self._conns[key] = conn
+            
+            try:
+                status, resp_headers, body = get(host, port, path, headers, use_ssl, conn, timeout)
+            except OSError:
+                self._drop(key)
+                # Only a reused socket may have been closed by the server while idle
+                if attempt or not reused:
+                    raise
+                continue
+            
+            # A body that runs to EOF leaves nothing to reuse afterwards
+            close = body.to_eof or resp_headers.get("connection", "").lower() == "close"
+            
+            def release(reader):
+                # Consume the rest of the body so the next request starts on a clean stream
+                drop = close
+                if not drop:
+                    try:
+                        while reader.read(1024):
+                            pass
+                    except OSError:
+                        drop = True
+                if drop:
+                    self._drop(key)
+            
+            response = Response(status, resp_headers, body, release)
+            if not stream:
+                response.content
+            return response
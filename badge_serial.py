@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Serial port discovery and REPL helpers shared by the host-side Badger 2040 W scripts
+"""
+
+import os
+import struct
+import time
+from typing import Optional
+import serial
+
+# Device name prefixes under /dev, in order of preference (macOS, Linux CDC, USB-serial)
+DEVICE_PREFIXES = ('tty.usbmodem', 'ttyACM', 'ttyUSB')
+
+RAW_REPL_PROMPT = b'raw REPL; CTRL-B to exit\r\n>'
+
+# Program bytes written per pause when the firmware has no raw-paste flow control
+RAW_CHUNK = 256
+
+def find_device() -> Optional[str]:
+    """Find the connected Pico device with a single pass over /dev"""
+    best = None
+    best_rank = len(DEVICE_PREFIXES)
+    try:
+        with os.scandir('/dev') as entries:
+            for entry in entries:
+                if not entry.name.startswith(DEVICE_PREFIXES):
+                    continue
+                for rank in range(best_rank):
+                    if entry.name.startswith(DEVICE_PREFIXES[rank]):
+                        best, best_rank = entry.path, rank
+                        break
+                if best_rank == 0:
+                    break
+    except OSError:
+        return None
+    return best
+
+def wait_for_device(timeout: int = 10) -> Optional[str]:
+    """Wait for device to become available"""
+    print(f"⏳ Waiting for device (timeout: {timeout}s)...")
+    deadline = time.monotonic() + timeout
+    
+    while time.monotonic() < deadline:
+        device = find_device()
+        if device:
+            print(f"✅ Found device: {device}")
+            return device
+        time.sleep(0.25)
+    
+    print("❌ Device not found")
+    return None
+
+def wait_prompt(ser, timeout: float = 0.25) -> bytes:
+    """Read until a >>> prompt arrives or timeout seconds pass, returning what was read"""
+    data = bytearray()
+    deadline = time.monotonic() + timeout
+    saved_timeout = ser.timeout
+    # Short reads so a long port timeout can't overshoot the deadline
+    ser.timeout = 0.05
+    try:
+        while b'>>>' not in data and time.monotonic() < deadline:
+            data.extend(ser.read(max(1, ser.in_waiting)))
+    finally:
+        ser.timeout = saved_timeout
+    return bytes(data)
+
+def open_repl(device: str, timeout: float = 1.0) -> serial.Serial:
+    """Open the device's REPL port at the Badger's 115200 baud"""
+    return serial.Serial(device, 115200, timeout=timeout)
+
+def send_ctrl_c(ser, timeout: float = 0.25) -> bytes:
+    """Interrupt any running program and wait for the prompt, returning what was read"""
+    ser.write(b'\r\x03')
+    return wait_prompt(ser, timeout)
+
+def read_until(ser: serial.Serial, ending: bytes, timeout: float = 10) -> bytes:
+    """Read until the data ends with ending or timeout seconds pass
+    
+    Reads a byte at a time so nothing after ending is consumed; each read
+    blocks in the serial driver for up to ser.timeout instead of polling.
+    """
+    data = bytearray()
+    deadline = time.monotonic() + timeout
+    while not data.endswith(ending) and time.monotonic() < deadline:
+        data.extend(ser.read(1))
+    return bytes(data)
+
+def raw_paste_write(ser: serial.Serial, program: bytes) -> None:
+    """Send program in raw-paste mode, honouring the device's flow-control window"""
+    window = struct.unpack('<H', ser.read(2))[0]
+    remain = window
+    data = memoryview(program)
+    i = 0
+    while i < len(program):
+        while remain == 0 or ser.in_waiting:
+            flag = ser.read(1)
+            if flag == b'\x01':
+                remain += window
+            elif flag == b'\x04':
+                # Device ended the paste early (e.g. a syntax error is coming)
+                ser.write(b'\x04')
+                return
+            else:
+                raise IOError(f"unexpected raw-paste reply: {flag!r}")
+        # Everything the window allows in one write, sliced without copying
+        piece = data[i:i + remain]
+        ser.write(piece)
+        remain -= len(piece)
+        i += len(piece)
+    
+    ser.write(b'\x04')
+    if not read_until(ser, b'\x04').endswith(b'\x04'):
+        raise IOError("device did not acknowledge end of raw paste")
+
+def exec_raw(ser: serial.Serial, program) -> None:
+    """Start program (str or bytes) in the raw REPL, via raw-paste when the firmware supports it"""
+    if isinstance(program, str):
+        program = program.encode()
+    ser.write(b'\x05A\x01')
+    reply = ser.read(2)
+    if reply == b'R\x01':
+        raw_paste_write(ser, program)
+        return
+    if reply != b'R\x00':
+        # Firmware predates raw-paste and treated the request as input
+        read_until(ser, RAW_REPL_PROMPT)
+    
+    for i in range(0, len(program), RAW_CHUNK):
+        ser.write(program[i:i + RAW_CHUNK])
+        time.sleep(0.01)
+    ser.write(b'\x04')
+    reply = ser.read(2)
+    if reply != b'OK':
+        raise IOError(f"could not execute program: {reply!r}")
+
+def open_raw_repl(device_path: str) -> Optional[serial.Serial]:
+    """Open the device, interrupt any running program and enter raw REPL mode"""
+    ser = open_repl(device_path, timeout=0.5)
+    ser.write(b'\x03\x03\x01')
+    response = read_until(ser, RAW_REPL_PROMPT, timeout=5)
+    if not response.endswith(RAW_REPL_PROMPT):
+        print(f"❌ Failed to enter raw REPL: {response}")
+        ser.close()
+        return None
+    return ser
@@ -0,0 +1,124 @@
+# Shared display helpers for the Badger 2040 W badge apps
+# main.py and main_github_api.py draw their chrome through here instead of carrying copies
+
+import badger2040
+from badger2040 import WIDTH, HEIGHT
+import time
+
+# Display
+display = badger2040.Badger2040()
+display.led(128)
+display.set_update_speed(badger2040.UPDATE_FAST)
+display.connect()
+
+# Header strings and title positions, computed once
+indicators = {}
+title_positions = {}
+
+# Footer wording, set once by each app with set_footer_labels()
+footer_labels = {"prefix": "Updated: ", "empty": "No data"}
+
+# Panel rows below the header; partial_update() needs y and height on 8-pixel rows
+CONTENT_TOP = 16
+
+# What the panel currently shows, so a redraw of the same page only refreshes the content rows
+panel = {"page": None, "full": True, "partial": False}
+
+
+def draw_header(title, page_idx, n_pages):
+    """Draw header"""
+    display.set_pen(0)
+    display.rectangle(0, 0, WIDTH, 20)
+    display.set_pen(15)
+    display.set_font("bitmap8")
+    display.text("GitHub", 4, 6, WIDTH, 1)
+    
+    # Page indicator
+    indicator = indicators.get(page_idx)
+    if indicator is None:
+        indicator = indicators[page_idx] = f"{page_idx + 1}/{n_pages}"
+    display.text(indicator, WIDTH - 30, 6, WIDTH, 1)
+    
+    # Title (measured once per title)
+    display.set_font("bitmap6")
+    title_x = title_positions.get(title)
+    if title_x is None:
+        title_x = title_positions[title] = (WIDTH - display.measure_text(title, 1)) // 2
+    display.text(title, title_x, 6, WIDTH, 1)
+
+
+def set_footer_labels(prefix, empty_text):
+    """Set the footer's age prefix and the text shown before any data arrives"""
+    footer_labels["prefix"] = prefix
+    footer_labels["empty"] = empty_text
+
+
+def draw_footer(timestamp):
+    """Draw status footer showing how old the data fetched at timestamp is"""
+    display.set_pen(0)
+    display.set_font("bitmap6")
+    
+    if timestamp > 0:
+        age = int((time.time() - timestamp) / 60)
+        status = footer_labels["prefix"] + (str(age) + "m ago" if age < 60 else str(age // 60) + "h ago")
+    else:
+        status = footer_labels["empty"]
+    
+    display.text(status, 5, HEIGHT - 10, WIDTH, 1)
+
+
+def invalidate_panel():
+    """Make the next page a full refresh, e.g. after a splash or message screen"""
+    panel["full"] = True
+
+
+def begin_page(title, page_idx, n_pages, full=False):
+    """Clear the panel (or just its content rows) and draw the header
+    
+    Redrawing the page already on the panel only clears the content rows so
+    end_page() can push them with a partial update. full=True marks a page
+    that fills the panel, so whatever is drawn after it gets a full refresh.
+    """
+    partial = not full and not panel["full"] and panel["page"] == page_idx
+    panel["page"] = page_idx
+    panel["full"] = full
+    panel["partial"] = partial
+    
+    display.set_pen(15)
+    if partial:
+        display.rectangle(0, CONTENT_TOP, WIDTH, HEIGHT - CONTENT_TOP)
+    else:
+        display.clear()
+    draw_header(title, page_idx, n_pages)
+
+
+def push_page():
+    """Push the page drawn since begin_page(), refreshing only the content rows when possible"""
+    if panel["partial"]:
+        display.partial_update(0, CONTENT_TOP, WIDTH, HEIGHT - CONTENT_TOP)
+    else:
+        display.update()
+
+
+def end_page(timestamp, message=None, update=True):
+    """Draw an optional placeholder message and the footer, then push the frame"""
+    if message:
+        display.set_pen(0)
+        display.text(message, 5, 50, WIDTH, 1)
+    draw_footer(timestamp)
+    if update:
+        push_page()
+
+
+def read_buttons(buttons):
+    """Return a tuple with the pressed state of each button in buttons"""
+    return tuple(display.pressed(button) for button in buttons)
+
+
+def wait_for_button(buttons):
+    """Block until any of buttons is pressed"""
+    while True:
+        for button in buttons:
+            if display.pressed(button):
+                return button
+        time.sleep(0.1)
@@ -5,9 +5,72 @@ Debug network connectivity and GitHub API access on Badger 2040 W
 
 import network
 import urequests
+import socket
+import json
 import time
 import gc
 
+try:
+    import ssl
+except ImportError:
+    import ussl as ssl
+
+API_HOST = 'api.github.com'
+API_HEADERS = (
+    'User-Agent: BadgerGitHubBadge/1.0\r\n'
+    'Accept: application/vnd.github.v3+json\r\n'
+)
+
+
+def open_github_connection():
+    """Open one TLS connection to the GitHub API for all probes"""
+    addr = socket.getaddrinfo(API_HOST, 443)[0][-1]
+    sock = socket.socket()
+    sock.connect(addr)
+    return ssl.wrap_socket(sock, server_hostname=API_HOST)
+
+
+def read_exact(conn, size):
+    """Read exactly size bytes from conn"""
+    body = b''
+    while len(body) < size:
+        chunk = conn.read(size - len(body))
+        if not chunk:
+            break
+        body += chunk
+    return body
+
+
+def github_get(conn, path):
+    """Send a keep-alive GET over conn and return (status, headers, body)"""
+    conn.write(f'GET {path} HTTP/1.1\r\nHost: {API_HOST}\r\n{API_HEADERS}'
+               'Connection: keep-alive\r\n\r\n'.encode())
+    
+    status = int(conn.readline().split(None, 2)[1])
+    headers = {}
+    while True:
+        line = conn.readline()
+        if not line or line == b'\r\n':
+            break
+        name, value = line.decode().split(':', 1)
+        headers[name.strip().lower()] = value.strip()
+    
+    # Consume the whole body so the next request starts on a clean stream
+    if headers.get('transfer-encoding') == 'chunked':
+        body = b''
+        while True:
+            size = int(conn.readline().split(b';')[0], 16)
+            if size == 0:
+                conn.readline()
+                break
+            body += read_exact(conn, size)
+            conn.readline()
+    else:
+        body = read_exact(conn, int(headers.get('content-length', 0)))
+    
+    return status, headers, body
+
+
 def test_network():
     """Test network connectivity and GitHub API access"""
     print("=== Network Debug Test ===")
@@ -24,72 +87,66 @@ def test_network():
         print(f"Gateway: {config[2]}")
         print(f"DNS: {config[3]}")
         
-        # Test basic connectivity
-        print("\n=== Testing Basic Connectivity ===")
-        try:
-            print("Testing httpbin.org...")
-            response = urequests.get('http://httpbin.org/ip', timeout=10)
-            print(f"Status: {response.status_code}")
-            print(f"Response: {response.text}")
-            response.close()
-        except Exception as e:
-            print(f"Basic HTTP Error: {e}")
-        
-        # Test HTTPS connectivity
+        # Test HTTPS connectivity (both endpoints share one TLS handshake)
         print("\n=== Testing HTTPS Connectivity ===")
+        github_ok = False
+        conn = None
         try:
             print("Testing GitHub API...")
-            headers = {
-                'User-Agent': 'BadgerGitHubBadge/1.0',
-                'Accept': 'application/vnd.github.v3+json'
-            }
+            conn = open_github_connection()
             
             # Test with a simple endpoint first
-            response = urequests.get('https://api.github.com/rate_limit', 
-                                   headers=headers, timeout=15)
-            print(f"GitHub Rate Limit Status: {response.status_code}")
+            status, headers, body = github_get(conn, '/rate_limit')
+            print(f"GitHub Rate Limit Status: {status}")
             
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
+                data = json.loads(body)
                 print(f"Rate limit: {data['rate']['remaining']}/{data['rate']['limit']}")
                 print(f"Reset time: {data['rate']['reset']}")
-            elif response.status_code == 403:
+            elif status == 403:
                 print("Rate limited or forbidden")
-                print(f"Response headers: {response.headers}")
-                print(f"Response text: {response.text}")
+                print(f"Response headers: {headers}")
+                print(f"Response text: {body}")
             else:
-                print(f"Unexpected status: {response.text}")
+                print(f"Unexpected status: {body}")
             
-            response.close()
+            # Test actual user endpoint
+            print("\n=== Testing User Endpoint ===")
+            status, headers, body = github_get(conn, '/users/octocat')
+            print(f"User API Status: {status}")
             
-        except Exception as e:
-            print(f"GitHub API Error: {e}")
-            import sys
-            sys.print_exception(e)
-        
-        # Test actual user endpoint
-        print("\n=== Testing User Endpoint ===")
-        try:
-            response = urequests.get('https://api.github.com/users/octocat', 
-                                   headers=headers, timeout=15)
-            print(f"User API Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
+                data = json.loads(body)
                 print(f"User: {data.get('login')}")
                 print(f"Name: {data.get('name')}")
                 print(f"Public repos: {data.get('public_repos')}")
+                github_ok = True
             else:
-                print(f"User API Response: {response.text[:200]}")
-            
-            response.close()
-            
+                print(f"User API Response: {body[:200]}")
+        
         except Exception as e:
-            print(f"User API Error: {e}")
+            print(f"GitHub API Error: {e}")
+            import sys
+            sys.print_exception(e)
+        finally:
+            if conn:
+                conn.close()
+        
+        # Only probe plain HTTP when HTTPS failed, to narrow down the problem
+        if not github_ok:
+            print("\n=== Testing Basic Connectivity ===")
+            try:
+                print("Testing httpbin.org...")
+                response = urequests.get('http://httpbin.org/ip', timeout=10)
+                print(f"Status: {response.status_code}")
+                print(f"Response: {response.text}")
+                response.close()
+            except Exception as e:
+                print(f"Basic HTTP Error: {e}")
     
     else:
         print("WiFi not connected!")
-        
+    
     # Memory cleanup
     gc.collect()
     print(f"\nFree memory: {gc.mem_free()} bytes")
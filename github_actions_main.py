@@ -4,10 +4,11 @@
 
 import badger2040
 from badger2040 import WIDTH, HEIGHT
-import urequests
+from badge_http import Session, resolve_url
 import time
 import json
 import gc
+import machine
 import badger_os
 
 # Try to import QR code module
@@ -17,125 +18,290 @@ try:
 except ImportError:
     HAS_QRCODE = False
 
-# Configuration
+# Try to import MessagePack decoder for the binary payload
 try:
-    from badge_config import GITHUB_USERNAME, BADGE_REPO_NAME
-    USERNAME = GITHUB_USERNAME
-    REPO_NAME = BADGE_REPO_NAME
+    import umsgpack
+    HAS_MSGPACK = True
 except ImportError:
-    USERNAME = "Julian-Elliott"
-    REPO_NAME = "badger-github-badge"
+    HAS_MSGPACK = False
+
+# Configuration (frozen alongside this module, see manifest.py)
+from badge_config import GITHUB_USERNAME, BADGE_REPO_NAME
+USERNAME = GITHUB_USERNAME
+REPO_NAME = BADGE_REPO_NAME
 
 BASE_URL = f"https://{USERNAME}.github.io/{REPO_NAME}/api"
 
 # Data URLs
 COMPACT_DATA_URL = f"{BASE_URL}/badge_compact.json"
+MSGPACK_DATA_URL = f"{BASE_URL}/badge_compact.msgpack"
 SIMPLE_DATA_URL = f"{BASE_URL}/badge_simple.txt"
 
+# One keep-alive connection to GitHub Pages, shared by every data source
+session = Session()
+
 # Page configuration
 PAGES = ["overview", "stats", "activity", "qr"]
 CURRENT_PAGE = 0
 
-# Smart cache system - stores data for each page
-CACHE = {
-    "data": None,
-    "pages": {},
-    "last_update": 0,
-    "update_count": 0
-}
+# Static UI strings, built once instead of on every repaint
+PAGE_INDICATORS = tuple(f"{i + 1}/{len(PAGES)}" for i in range(len(PAGES)))
+CONTROLS_HINT = "↑↓:Nav A:Update B:Cache C:View"
+
+# Last formatted footer status and stat lines, reused while their inputs are unchanged
+FOOTER_STATUS = {"age": None, "text": ""}
+STAT_TEXT = {}
+
+# Smart cache system - one copy of the data, split into per-page sections
+class _Cache:
+    data = None
+    profile = {}
+    stats = {}
+    activity_lines = ()
+    page_ts = {}
+    last_update = 0
+    update_count = 0
+    source_url = None
+    etag = None
+    last_modified = None
+    next_attempt_ms = 0
+    fail_count = 0
+
+# What is currently on the panel, so unchanged pages only repaint the footer
+LAST_RENDER = {"page": None, "sig": None}
+
+# Font currently selected on the display, so repeated set_font calls are skipped
+FONT_STATE = {"font": None}
 
 UPDATE_INTERVAL = 1800  # 30 minutes
 
+# Retry delays after a failed update: 30 s doubling up to 5 minutes
+RETRY_BASE_MS = 30_000
+RETRY_MAX_MS = 300_000
+
+# Last good data is kept on flash so a power cycle can render without the network
+CACHE_FILE = "/cache.json"
+
+# Footer band for partial updates (e-ink rows must be 8-pixel aligned)
+FOOTER_TOP = HEIGHT - 16
+FOOTER_H = HEIGHT - FOOTER_TOP
+
+# Layout coordinates, computed once instead of on every repaint
+HALFW = WIDTH // 2
+COL2_X = HALFW + 10
+TEXT_W = WIDTH - 10
+FOOTER_Y1 = HEIGHT - 12
+FOOTER_Y2 = HEIGHT - 2
+CONTENT_BOTTOM = HEIGHT - 25
+QR_MAX_SIZE = min(80, HEIGHT - 50)
+
 # Initialize display
 display = badger2040.Badger2040()
 display.led(128)
 display.set_update_speed(badger2040.UPDATE_FAST)
 display.connect()
 
+# Look up GitHub Pages once the display has brought Wi-Fi up; reconnects reuse the address
+resolve_url(BASE_URL)
+
+# Button pins, read together as a bitmask in this order
+BUTTON_PINS = [machine.Pin(gpio, machine.Pin.IN, machine.Pin.PULL_DOWN)
+               for gpio in (badger2040.BUTTON_UP, badger2040.BUTTON_DOWN, badger2040.BUTTON_A,
+                            badger2040.BUTTON_B, badger2040.BUTTON_C)]
+BTN_UP = 1
+BTN_DOWN = 2
+BTN_A = 4
+BTN_B = 8
+BTN_C = 16
+
+# Button presses latched by pin IRQs while the board sleeps between events
+BUTTON_FLAGS = 0
+
 # QR code setup
 if HAS_QRCODE:
     qr_code = qrcode.QRCode()
 
+# Dark-module runs to paint for the QR code, rebuilt only when the URL changes
+QR_BITMAP_CACHE = {"url": None, "w": 0, "runs": ()}
+
 
-def cache_page_data(page_name, data):
-    """Cache data for specific page"""
-    CACHE["pages"][page_name] = {
-        "data": data,
-        "timestamp": time.time()
-    }
+def cache_page_data(page_name):
+    """Record when data for a specific page was cached"""
+    _Cache.page_ts[page_name] = time.time()
     print(f"Cached data for page: {page_name}")
 
 
-def get_cached_page_data(page_name):
-    """Get cached data for specific page"""
-    if page_name in CACHE["pages"]:
-        cached = CACHE["pages"][page_name]
-        age = time.time() - cached["timestamp"]
-        print(f"Using cached data for {page_name} (age: {age:.0f}s)")
-        return cached["data"]
-    return None
+def set_cache_data(data):
+    """Store badge data and unpack the sections the pages read"""
+    _Cache.data = data
+    _Cache.profile = data.get("profile") or {}
+    _Cache.stats = data.get("stats") or {}
+    _Cache.activity_lines = format_activity_lines(data.get("activity") or [])
+
+
+def save_cache():
+    """Write the cached data and its validators to flash"""
+    try:
+        with open(CACHE_FILE, "w") as f:
+            json.dump({
+                "data": _Cache.data,
+                "ts": _Cache.last_update,
+                "source_url": _Cache.source_url,
+                "etag": _Cache.etag,
+                "last_modified": _Cache.last_modified
+            }, f)
+    except OSError as e:
+        print(f"Cache save error: {e}")
+
+
+def load_cache():
+    """Restore cached data from flash, if a previous run saved any"""
+    try:
+        with open(CACHE_FILE) as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return False
+    
+    # A file without usable data (damaged or from an older layout) counts as no cache
+    data = stored.get("data") if isinstance(stored, dict) else None
+    if not isinstance(data, dict):
+        return False
+    
+    set_cache_data(data)
+    # A timestamp from the future means the clock was reset; treat the data as stale
+    ts = stored.get("ts", 0)
+    _Cache.last_update = ts if ts <= time.time() else 0
+    _Cache.source_url = stored.get("source_url")
+    _Cache.etag = stored.get("etag")
+    _Cache.last_modified = stored.get("last_modified")
+    print("✓ Cache restored from flash")
+    return True
+
+
+def request_headers(url):
+    """Build request headers, adding cache validators for the cached URL"""
+    headers = {'User-Agent': 'BadgerGitHubBadge/1.0'}
+    
+    # Validators only apply to the URL the cached data came from
+    if _Cache.data and _Cache.source_url == url:
+        if _Cache.etag:
+            headers['If-None-Match'] = _Cache.etag
+        if _Cache.last_modified:
+            headers['If-Modified-Since'] = _Cache.last_modified
+    
+    return headers
+
+
+def store_validators(url, response):
+    """Remember ETag/Last-Modified so the next fetch can be conditional"""
+    _Cache.source_url = url
+    _Cache.etag = response.headers.get('etag')
+    _Cache.last_modified = response.headers.get('last-modified')
+
+
+def format_activity_lines(activity):
+    """Format the activity page lines once per fetch instead of every repaint"""
+    lines = []
+    for event in activity[:5]:  # Show up to 5 events
+        text = event.get('display') or f"{event.get('action', '')} {event.get('repo_short', '')}"
+        if len(text) > 40:
+            text = text[:37] + "..."
+        lines.append("• " + text)
+    return lines
 
 
 def fetch_badge_data():
     """Fetch badge data from GitHub Pages with fallback"""
-    global CACHE
-    
-    try:
-        print("Fetching data from GitHub Pages...")
-        response = urequests.get(COMPACT_DATA_URL, timeout=15)
-        
-        if response.status_code == 200:
-            data = response.json()
-            CACHE["data"] = data
-            CACHE["last_update"] = time.time()
-            CACHE["update_count"] += 1
+    # Binary payload first when a decoder is available; it is smaller and cheaper to parse
+    sources = ((MSGPACK_DATA_URL, umsgpack.load),) if HAS_MSGPACK else ()
+    for url, load in sources + ((COMPACT_DATA_URL, json.load),):
+        try:
+            print(f"Fetching data from {url}...")
+            gc.collect()
+            response = session.get(url, headers=request_headers(url), timeout=15, stream=True)
             
-            # Cache data for each page
-            cache_page_data("overview", data.get("profile", {}))
-            cache_page_data("stats", data.get("stats", {}))
-            cache_page_data("activity", data.get("activity", []))
-            cache_page_data("qr", {"url": data.get("profile", {}).get("html_url", "")})
+            try:
+                if response.status_code == 304:
+                    _Cache.last_update = time.time()
+                    # Persist the new timestamp so a reboot doesn't refetch revalidated data
+                    save_cache()
+                    print("✓ Data unchanged (304)")
+                    return True
+                
+                if response.status_code == 200:
+                    # Parse straight from the socket so the body is never buffered
+                    gc.collect()
+                    data = load(response.stream)
+                    set_cache_data(data)
+                    store_validators(url, response)
+                    _Cache.last_update = time.time()
+                    _Cache.update_count += 1
+                    
+                    # Cache data for each page
+                    for page_name in PAGES:
+                        cache_page_data(page_name)
+                    save_cache()
+                    
+                    print("✓ Data updated and cached")
+                    return True
+                
+                print(f"HTTP {response.status_code} from {url}")
+            finally:
+                response.close()
+                gc.collect()
             
-            print("✓ Data updated and cached")
-            response.close()
-            return True
-        
-        response.close()
-        
-    except Exception as e:
-        print(f"Fetch error: {e}")
+        except Exception as e:
+            print(f"Fetch error: {e}")
     
     # Try simple text fallback
     try:
         print("Trying simple text fallback...")
-        response = urequests.get(SIMPLE_DATA_URL, timeout=10)
+        gc.collect()
+        response = session.get(SIMPLE_DATA_URL, headers=request_headers(SIMPLE_DATA_URL), timeout=10, stream=True)
         
-        if response.status_code == 200:
-            lines = response.text.strip().split('\n')
-            if len(lines) >= 8:
-                simple_data = {
-                    'profile': {
-                        'username': lines[0],
-                        'name': lines[1],
-                        'public_repos': int(lines[2]),
-                        'followers': int(lines[3]),
-                        'html_url': f'https://github.com/{lines[0]}'
-                    },
-                    'stats': {
-                        'total_stars': int(lines[4]),
-                        'total_forks': int(lines[5]),
-                        'top_language': lines[6]
-                    },
-                    'activity': [],
-                    'meta': {'source': 'simple_text'}
-                }
-                CACHE["data"] = simple_data
-                CACHE["last_update"] = time.time()
-                print("✓ Simple data loaded")
-                response.close()
+        try:
+            if response.status_code == 304:
+                _Cache.last_update = time.time()
+                save_cache()
+                print("✓ Simple data unchanged (304)")
                 return True
-        
-        response.close()
+            
+            if response.status_code == 200:
+                # Read only the lines we need, one at a time:
+                # username, name, repos, followers, following, stars, forks, top language
+                lines = []
+                while len(lines) < 8:
+                    line = response.stream.readline()
+                    if not line:
+                        break
+                    lines.append(line.decode().strip())
+                
+                if len(lines) >= 8:
+                    simple_data = {
+                        'profile': {
+                            'username': lines[0],
+                            'name': lines[1],
+                            'public_repos': int(lines[2]),
+                            'followers': int(lines[3]),
+                            'html_url': f'https://github.com/{lines[0]}'
+                        },
+                        'stats': {
+                            'total_stars': int(lines[5]),
+                            'total_forks': int(lines[6]),
+                            'top_language': lines[7]
+                        },
+                        'activity': [],
+                        'meta': {'source': 'simple_text'}
+                    }
+                    set_cache_data(simple_data)
+                    _Cache.last_update = time.time()
+                    store_validators(SIMPLE_DATA_URL, response)
+                    save_cache()
+                    print("✓ Simple data loaded")
+                    return True
+        finally:
+            response.close()
+            gc.collect()
         
     except Exception as e:
         print(f"Simple fallback error: {e}")
@@ -143,14 +309,26 @@ def fetch_badge_data():
     return False
 
 
+def schedule_update(ok, delay_ms=None):
+    """Set the next auto-update time, backing off exponentially after failures"""
+    if ok:
+        _Cache.fail_count = 0
+        if delay_ms is None:
+            delay_ms = UPDATE_INTERVAL * 1000
+    else:
+        _Cache.fail_count += 1
+        delay_ms = min(RETRY_MAX_MS, RETRY_BASE_MS << (_Cache.fail_count - 1))
+    _Cache.next_attempt_ms = time.ticks_add(time.ticks_ms(), delay_ms)
+
+
 def update_data():
     """Update data with visual feedback"""
     display.set_pen(15)
     display.clear()
     display.set_pen(0)
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     display.text("Updating...", 5, 40, WIDTH, 1)
-    display.set_font("bitmap6")
+    use_font("bitmap6")
     display.text("Downloading from GitHub Pages", 5, 55, WIDTH, 1)
     display.update()
     
@@ -160,80 +338,142 @@ def update_data():
     display.set_pen(15)
     display.clear()
     display.set_pen(0)
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     
     if success:
         display.text("✓ Updated", 5, 45, WIDTH, 1)
-        display.set_font("bitmap6")
-        display.text(f"Cache: {len(CACHE['pages'])} pages", 5, 60, WIDTH, 1)
+        use_font("bitmap6")
+        display.text(f"Cache: {len(_Cache.page_ts)} pages", 5, 60, WIDTH, 1)
     else:
         display.text("✗ Failed", 5, 45, WIDTH, 1)
-        display.set_font("bitmap6")
+        use_font("bitmap6")
         display.text("Using cached data", 5, 60, WIDTH, 1)
     
     display.update()
+    invalidate_render()
     time.sleep(1.5)
-    gc.collect()
     return success
 
 
+def use_font(font):
+    """Select font on the display, skipping the call if it is already active"""
+    if FONT_STATE["font"] != font:
+        display.set_font(font)
+        FONT_STATE["font"] = font
+
+
 def draw_header(title):
     """Draw professional header"""
     display.set_pen(0)
     display.rectangle(0, 0, WIDTH, 22)
     display.set_pen(15)
     
+    # Title centered (drawn first so bitmap8 is left active for the page heading)
+    use_font("bitmap6")
+    title_width = display.measure_text(title, 1)
+    display.text(title, (WIDTH - title_width) // 2, 7, WIDTH, 1)
+    
     # GitHub branding
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     display.text("GitHub", 4, 7, WIDTH, 1)
     
     # Page indicator
-    page_indicator = f"{CURRENT_PAGE + 1}/{len(PAGES)}"
+    page_indicator = PAGE_INDICATORS[CURRENT_PAGE]
     nav_width = display.measure_text(page_indicator, 1)
     display.text(page_indicator, WIDTH - nav_width - 4, 7, WIDTH, 1)
-    
-    # Title centered
-    display.set_font("bitmap6")
-    title_width = display.measure_text(title, 1)
-    display.text(title, (WIDTH - title_width) // 2, 7, WIDTH, 1)
+
+
+def footer_age():
+    """Data age in minutes as the footer shows it (whole hours past 60), -1 with no data"""
+    if _Cache.last_update <= 0:
+        return -1
+    age = int((time.time() - _Cache.last_update) // 60)
+    return age if age < 60 else age - age % 60
+
+
+def ms_until_footer_change():
+    """Milliseconds until footer_age() next changes, or None with no data"""
+    if _Cache.last_update <= 0:
+        return None
+    age = time.time() - _Cache.last_update
+    step = 60 if age < 3600 else 3600
+    return int((step - age % step) * 1000)
 
 
 def draw_footer():
     """Draw status footer"""
     display.set_pen(0)
-    display.set_font("bitmap6")
-    
-    # Cache status
-    if CACHE["last_update"] > 0:
-        age = int((time.time() - CACHE["last_update"]) / 60)
-        if age < 60:
-            status = f"Updated: {age}m ago"
+    use_font("bitmap6")
+    
+    # Cache status, reformatted only when the age the footer shows changes
+    age = footer_age()
+    if age != FOOTER_STATUS["age"]:
+        FOOTER_STATUS["age"] = age
+        if age < 0:
+            FOOTER_STATUS["text"] = "Data: cached"
+        elif age < 60:
+            FOOTER_STATUS["text"] = f"Updated: {age}m ago"
         else:
-            status = f"Updated: {age//60}h ago"
-    else:
-        status = "Data: cached"
+            FOOTER_STATUS["text"] = f"Updated: {age//60}h ago"
     
-    display.text(status, 5, HEIGHT - 12, WIDTH, 1)
+    display.text(FOOTER_STATUS["text"], 5, FOOTER_Y1, WIDTH, 1)
     
     # Controls hint
-    display.text("↑↓:Nav A:Update B:Cache C:View", 5, HEIGHT - 2, WIDTH, 1)
+    display.text(CONTROLS_HINT, 5, FOOTER_Y2, WIDTH, 1)
+
+
+def stat_text(label, value):
+    """Return "label: value", formatting a new string only when value changes"""
+    cached = STAT_TEXT.get(label)
+    if cached is None or cached[0] != value:
+        cached = (value, f"{label}: {value}")
+        STAT_TEXT[label] = cached
+    return cached[1]
+
+
+def invalidate_render():
+    """Force the next page draw to repaint the whole panel"""
+    LAST_RENDER["page"] = None
+    LAST_RENDER["sig"] = None
+
+
+def redraw_footer_only(sig):
+    """Repaint just the footer if the current page already shows sig"""
+    if LAST_RENDER["page"] == CURRENT_PAGE and LAST_RENDER["sig"] == sig:
+        display.set_pen(15)
+        display.rectangle(0, FOOTER_TOP, WIDTH, FOOTER_H)
+        draw_footer()
+        display.set_update_speed(badger2040.UPDATE_TURBO)
+        display.partial_update(0, FOOTER_TOP, WIDTH, FOOTER_H)
+        display.set_update_speed(badger2040.UPDATE_FAST)
+        return True
+    
+    LAST_RENDER["page"] = CURRENT_PAGE
+    LAST_RENDER["sig"] = sig
+    return False
 
 
 def draw_overview_page():
     """Draw overview page"""
+    # Get data from cache or main cache
+    profile = _Cache.profile
+    stats = _Cache.stats
+    
+    sig = (profile.get('name'), profile.get('username'), profile.get('public_repos'),
+           profile.get('followers'), stats.get('total_stars'), stats.get('total_forks'),
+           stats.get('top_language'))
+    if redraw_footer_only(sig):
+        return
+    
     display.set_pen(15)
     display.clear()
     draw_header("Overview")
     
-    # Get data from cache or main cache
-    profile = get_cached_page_data("overview") or CACHE.get("data", {}).get("profile", {})
-    stats = CACHE.get("data", {}).get("stats", {})
-    
     if not profile:
         display.set_pen(0)
-        display.set_font("bitmap8")
+        use_font("bitmap8")
         display.text("No data available", 5, 50, WIDTH, 1)
-        display.set_font("bitmap6")
+        use_font("bitmap6")
         display.text("Press A to update", 5, 65, WIDTH, 1)
         draw_footer()
         display.update()
@@ -243,33 +483,33 @@ def draw_overview_page():
     y = 28
     
     # User info
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     name = profile.get('name', profile.get('username', USERNAME))
     if len(name) > 20:
         name = name[:17] + "..."
-    display.text(name, 5, y, WIDTH - 10, 1)
+    display.text(name, 5, y, TEXT_W, 1)
     y += 16
     
-    display.set_font("bitmap6")
-    display.text(f"@{profile.get('username', USERNAME)}", 5, y, WIDTH - 10, 1)
+    use_font("bitmap6")
+    display.text(f"@{profile.get('username', USERNAME)}", 5, y, TEXT_W, 1)
     y += 14
     
     # Stats in columns
     col1_x = 5
-    col2_x = WIDTH // 2 + 10
+    col2_x = COL2_X
     
-    display.text(f"Repos: {profile.get('public_repos', 0)}", col1_x, y, WIDTH//2, 1)
-    display.text(f"Stars: {stats.get('total_stars', 0)}", col2_x, y, WIDTH//2, 1)
+    display.text(stat_text("Repos", profile.get('public_repos', 0)), col1_x, y, HALFW, 1)
+    display.text(stat_text("Stars", stats.get('total_stars', 0)), col2_x, y, HALFW, 1)
     y += 12
     
-    display.text(f"Followers: {profile.get('followers', 0)}", col1_x, y, WIDTH//2, 1)
-    display.text(f"Forks: {stats.get('total_forks', 0)}", col2_x, y, WIDTH//2, 1)
+    display.text(stat_text("Followers", profile.get('followers', 0)), col1_x, y, HALFW, 1)
+    display.text(stat_text("Forks", stats.get('total_forks', 0)), col2_x, y, HALFW, 1)
     y += 12
     
     # Top language
     top_lang = stats.get('top_language')
     if top_lang and top_lang != 'None':
-        display.text(f"Top Language: {top_lang}", 5, y, WIDTH, 1)
+        display.text(stat_text("Top Language", top_lang), 5, y, WIDTH, 1)
     
     draw_footer()
     display.update()
@@ -277,15 +517,21 @@ def draw_overview_page():
 
 def draw_stats_page():
     """Draw statistics page"""
+    stats = _Cache.stats
+    profile = _Cache.profile
+    
+    sig = (profile.get('public_repos'), stats.get('total_stars'), stats.get('total_forks'),
+           stats.get('most_starred'))
+    if redraw_footer_only(sig):
+        return
+    
     display.set_pen(15)
     display.clear()
     draw_header("Statistics")
     
-    stats = get_cached_page_data("stats") or CACHE.get("data", {}).get("stats", {})
-    profile = CACHE.get("data", {}).get("profile", {})
-    
     if not stats:
         display.set_pen(0)
+        use_font("bitmap6")
         display.text("No stats available", 5, 50, WIDTH, 1)
         draw_footer()
         display.update()
@@ -295,16 +541,16 @@ def draw_stats_page():
     y = 28
     
     # Repository statistics
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     display.text("Repository Stats", 5, y, WIDTH, 1)
     y += 16
     
-    display.set_font("bitmap6")
-    display.text(f"Total Repos: {profile.get('public_repos', 0)}", 5, y, WIDTH, 1)
+    use_font("bitmap6")
+    display.text(stat_text("Total Repos", profile.get('public_repos', 0)), 5, y, WIDTH, 1)
     y += 12
-    display.text(f"Total Stars: {stats.get('total_stars', 0)}", 5, y, WIDTH, 1)
+    display.text(stat_text("Total Stars", stats.get('total_stars', 0)), 5, y, WIDTH, 1)
     y += 12
-    display.text(f"Total Forks: {stats.get('total_forks', 0)}", 5, y, WIDTH, 1)
+    display.text(stat_text("Total Forks", stats.get('total_forks', 0)), 5, y, WIDTH, 1)
     y += 14
     
     # Most starred repo
@@ -326,14 +572,18 @@ def draw_stats_page():
 
 def draw_activity_page():
     """Draw activity page"""
+    activity_lines = _Cache.activity_lines
+    
+    if redraw_footer_only(activity_lines):
+        return
+    
     display.set_pen(15)
     display.clear()
     draw_header("Activity")
     
-    activity = get_cached_page_data("activity") or CACHE.get("data", {}).get("activity", [])
-    
-    if not activity:
+    if not activity_lines:
         display.set_pen(0)
+        use_font("bitmap6")
         display.text("No activity data", 5, 50, WIDTH, 1)
         draw_footer()
         display.update()
@@ -342,53 +592,82 @@ def draw_activity_page():
     display.set_pen(0)
     y = 28
     
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     display.text("Recent Events", 5, y, WIDTH, 1)
     y += 16
     
-    display.set_font("bitmap6")
+    use_font("bitmap6")
     
     # Show recent events
-    for i, event in enumerate(activity[:5]):  # Show up to 5 events
-        if y > HEIGHT - 25:  # Leave space for footer
+    for line in activity_lines:
+        if y > CONTENT_BOTTOM:  # Leave space for footer
             break
         
-        text = event.get('display', f"{event.get('action', '')} {event.get('repo_short', '')}")
-        if len(text) > 40:
-            text = text[:37] + "..."
-        
-        display.text(f"• {text}", 5, y, WIDTH, 1)
+        display.text(line, 5, y, WIDTH, 1)
         y += 12
     
     draw_footer()
     display.update()
 
 
+def get_qr_bitmap(url):
+    """Return (runs, width) for url, encoding the QR code only on a cache miss
+    
+    runs holds one (x, y, length) tuple per horizontal run of dark modules,
+    so a repaint is a flat list of rectangles with no per-module work.
+    """
+    if QR_BITMAP_CACHE["url"] != url:
+        qr_code.set_text(url)
+        w, h = qr_code.get_size()
+        runs = []
+        for y in range(h):
+            run_start = -1
+            for x in range(w):
+                if qr_code.get_module(x, y):
+                    if run_start < 0:
+                        run_start = x
+                elif run_start >= 0:
+                    runs.append((run_start, y, x - run_start))
+                    run_start = -1
+            if run_start >= 0:
+                runs.append((run_start, y, w - run_start))
+        
+        QR_BITMAP_CACHE["url"] = url
+        QR_BITMAP_CACHE["w"] = w
+        QR_BITMAP_CACHE["runs"] = tuple(runs)
+    
+    return QR_BITMAP_CACHE["runs"], QR_BITMAP_CACHE["w"]
+
+
 def draw_qr_page():
     """Draw QR code page"""
+    # Get GitHub URL
+    profile = _Cache.profile
+    github_url = profile.get('html_url', f'https://github.com/{USERNAME}')
+    
+    if redraw_footer_only(github_url):
+        return
+    
     display.set_pen(15)
     display.clear()
     draw_header("QR Code")
     
     if not HAS_QRCODE:
         display.set_pen(0)
+        use_font("bitmap6")
         display.text("QR module not available", 5, 50, WIDTH, 1)
         display.text("Install qrcode library", 5, 65, WIDTH, 1)
         draw_footer()
         display.update()
         return
     
-    # Get GitHub URL
-    profile = CACHE.get("data", {}).get("profile", {})
-    github_url = profile.get('html_url', f'https://github.com/{USERNAME}')
-    
     # Generate QR code
-    qr_code.set_text(github_url)
+    runs, w = get_qr_bitmap(github_url)
+    h = w
     
     # Draw QR code
     display.set_pen(15)
-    w, h = qr_code.get_size()
-    qr_size = min(80, (HEIGHT - 50) // h * h)  # Fit in available space
+    qr_size = QR_MAX_SIZE // h * h  # Fit in available space
     module_size = qr_size // w
     qr_x = (WIDTH - qr_size) // 2
     qr_y = 30
@@ -396,20 +675,16 @@ def draw_qr_page():
     # White background
     display.rectangle(qr_x - 2, qr_y - 2, qr_size + 4, qr_size + 4)
     
-    # Draw QR modules
+    # Draw the cached dark runs, one rectangle each
     display.set_pen(0)
-    for y in range(h):
-        for x in range(w):
-            if qr_code.get_module(x, y):
-                px = qr_x + x * module_size
-                py = qr_y + y * module_size
-                display.rectangle(px, py, module_size, module_size)
+    for x, y, n in runs:
+        display.rectangle(qr_x + x * module_size, qr_y + y * module_size, n * module_size, module_size)
     
     # GitHub URL text
-    display.set_font("bitmap6")
+    use_font("bitmap6")
     url_text = github_url.replace('https://', '')
     url_width = display.measure_text(url_text, 1)
-    display.text(url_text, (WIDTH - url_width) // 2, HEIGHT - 25, WIDTH, 1)
+    display.text(url_text, (WIDTH - url_width) // 2, CONTENT_BOTTOM, WIDTH, 1)
     
     draw_footer()
     display.update()
@@ -429,59 +704,83 @@ def draw_current_page():
         draw_qr_page()
 
 
+def _set_button_flag(bit):
+    """IRQ handler: remember that a button was pressed"""
+    global BUTTON_FLAGS
+    BUTTON_FLAGS |= bit
+
+
+def setup_button_irqs():
+    """Attach rising-edge IRQs so a press wakes the board from lightsleep"""
+    for i, pin in enumerate(BUTTON_PINS):
+        pin.irq(trigger=machine.Pin.IRQ_RISING, handler=lambda p, b=1 << i: _set_button_flag(b))
+
+
+def read_buttons():
+    """Return the buttons currently held as a BTN_* bitmask"""
+    return (BUTTON_PINS[0].value() | BUTTON_PINS[1].value() << 1 | BUTTON_PINS[2].value() << 2 |
+            BUTTON_PINS[3].value() << 3 | BUTTON_PINS[4].value() << 4)
+
+
 def handle_buttons():
     """Handle button presses with proper debouncing"""
-    global CURRENT_PAGE
+    global CURRENT_PAGE, BUTTON_FLAGS
+    
+    # Presses latched by IRQ plus anything held right now
+    mask = BUTTON_FLAGS | read_buttons()
     
-    if display.pressed(badger2040.BUTTON_UP):
+    if mask & BTN_UP:
         CURRENT_PAGE = (CURRENT_PAGE - 1) % len(PAGES)
         print(f"Page up: {PAGES[CURRENT_PAGE]}")
         draw_current_page()
         time.sleep(0.2)  # Debounce
         
-    elif display.pressed(badger2040.BUTTON_DOWN):
+    elif mask & BTN_DOWN:
         CURRENT_PAGE = (CURRENT_PAGE + 1) % len(PAGES)
         print(f"Page down: {PAGES[CURRENT_PAGE]}")
         draw_current_page()
         time.sleep(0.2)  # Debounce
         
-    elif display.pressed(badger2040.BUTTON_A):
+    elif mask & BTN_A:
         print("Manual update requested")
-        update_data()
+        schedule_update(update_data())
         draw_current_page()
         time.sleep(0.3)  # Longer debounce for update
         
-    elif display.pressed(badger2040.BUTTON_B):
+    elif mask & BTN_B:
         print(f"Reloading page from cache: {PAGES[CURRENT_PAGE]}")
+        invalidate_render()
         draw_current_page()
         time.sleep(0.2)  # Debounce
         
-    elif display.pressed(badger2040.BUTTON_C):
+    elif mask & BTN_C:
         # Show cache info
         display.set_pen(15)
         display.clear()
         display.set_pen(0)
-        display.set_font("bitmap8")
+        use_font("bitmap8")
         display.text("Cache Status", 5, 30, WIDTH, 1)
-        display.set_font("bitmap6")
-        display.text(f"Pages cached: {len(CACHE['pages'])}", 5, 50, WIDTH, 1)
-        display.text(f"Updates: {CACHE['update_count']}", 5, 65, WIDTH, 1)
-        if CACHE["last_update"]:
-            age = int((time.time() - CACHE["last_update"]) / 60)
+        use_font("bitmap6")
+        display.text(f"Pages cached: {len(_Cache.page_ts)}", 5, 50, WIDTH, 1)
+        display.text(f"Updates: {_Cache.update_count}", 5, 65, WIDTH, 1)
+        if _Cache.last_update:
+            age = int((time.time() - _Cache.last_update) / 60)
             display.text(f"Last update: {age}m ago", 5, 80, WIDTH, 1)
         display.text("Press any button to return", 5, HEIGHT - 15, WIDTH, 1)
         display.update()
+        invalidate_render()
         
         # Wait for button release and press
-        while display.pressed(badger2040.BUTTON_C):
-            time.sleep(0.1)
-        while not (display.pressed(badger2040.BUTTON_A) or display.pressed(badger2040.BUTTON_B) or 
-                  display.pressed(badger2040.BUTTON_C) or display.pressed(badger2040.BUTTON_UP) or 
-                  display.pressed(badger2040.BUTTON_DOWN)):
+        while read_buttons() & BTN_C:
             time.sleep(0.1)
+        while read_buttons() == 0:
+            machine.lightsleep(50)
         
         draw_current_page()
         time.sleep(0.2)
+    
+    # Drop edges latched while handling the press (bounce, held buttons)
+    BUTTON_FLAGS = 0
 
 
 def main():
@@ -492,43 +791,65 @@ def main():
     display.set_pen(15)
     display.clear()
     display.set_pen(0)
-    display.set_font("bitmap8")
+    use_font("bitmap8")
     display.text("GitHub Badge", 5, 30, WIDTH, 1)
-    display.set_font("bitmap6")
+    use_font("bitmap6")
     display.text("GitHub Actions Version", 5, 50, WIDTH, 1)
     display.text("Loading...", 5, 65, WIDTH, 1)
     display.update()
     
-    # Initial data fetch
-    if not CACHE["data"]:
+    # Collect incrementally before free memory fragments
+    gc.threshold(gc.mem_free() // 4)
+    
+    # Restore the last good data so the badge can render before the network is up
+    load_cache()
+    
+    # Initial data fetch, skipped while the stored copy is still fresh
+    age = time.time() - _Cache.last_update
+    if _Cache.data and age < UPDATE_INTERVAL:
+        schedule_update(True, (UPDATE_INTERVAL - age) * 1000)
+    else:
         print("Initial data fetch...")
-        if not fetch_badge_data():
+        ok = fetch_badge_data()
+        schedule_update(ok)
+        if not ok and not _Cache.data:
             print("Using demo data for first run")
-            CACHE["data"] = {
+            set_cache_data({
                 "profile": {"username": USERNAME, "public_repos": 0, "followers": 0},
                 "stats": {"total_stars": 0, "total_forks": 0},
                 "activity": [],
                 "meta": {"source": "demo"}
-            }
+            })
     
     # Draw initial page
     draw_current_page()
+    setup_button_irqs()
     
     # Main loop
     try:
         while True:
-            # Auto-update check
-            if time.time() - CACHE["last_update"] > UPDATE_INTERVAL:
+            # Auto-update check (monotonic, so clock changes cannot trigger or stall it)
+            if time.ticks_diff(time.ticks_ms(), _Cache.next_attempt_ms) >= 0:
                 print("Auto-update triggered")
-                update_data()
+                schedule_update(update_data())
+                draw_current_page()
+            
+            # The footer's "Xm ago" rolled over; the page is unchanged, so only the footer repaints
+            elif footer_age() != FOOTER_STATUS["age"]:
                 draw_current_page()
             
+            # Sleep until a button IRQ fires, the next update is due or the footer changes
+            if not BUTTON_FLAGS:
+                wait_ms = time.ticks_diff(_Cache.next_attempt_ms, time.ticks_ms())
+                footer_ms = ms_until_footer_change()
+                if footer_ms is not None and footer_ms < wait_ms:
+                    wait_ms = footer_ms
+                if wait_ms > 0:
+                    machine.lightsleep(wait_ms)
+            
             # Handle button input
             handle_buttons()
             
-            # Small delay to prevent excessive CPU usage
-            time.sleep(0.05)
-            
     except KeyboardInterrupt:
         print("Shutting down...")
     except Exception as e:
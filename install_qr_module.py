@@ -3,20 +3,8 @@
 Script to install QR code module on Badger 2040 W
 """
 
-import serial
 import time
-import glob
-from typing import Optional
-
-def find_device() -> Optional[str]:
-    """Find the Pico device"""
-    patterns = ['/dev/tty.usbmodem*', '/dev/ttyACM*', '/dev/ttyUSB*']
-    
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+from badge_serial import find_device, open_repl, send_ctrl_c
 
 def install_qr_module():
     """Install QR code module by running install_qrcode.py"""
@@ -28,11 +16,11 @@ def install_qr_module():
     try:
         print(f"📦 Installing QR code module on {device}...")
         
-        ser = serial.Serial(device, 115200, timeout=10)
+        # Short timeout so readline returns promptly while we wait for output
+        ser = open_repl(device, timeout=0.5)
         
         # Send Ctrl+C to interrupt
-        ser.write(b'\x03')
-        time.sleep(0.5)
+        send_ctrl_c(ser, timeout=0.5)
         
         # Clear input buffer
         ser.reset_input_buffer()
@@ -42,10 +30,23 @@ def install_qr_module():
         ser.write(command.encode())
         
         print("⏳ Installing QR code module (this may take a while)...")
-        time.sleep(5)  # Give time for installation
         
-        # Read response
-        response = ser.read(1000).decode('utf-8', errors='ignore')
+        # Read until the REPL prompt returns, giving up after 30 s of silence
+        output = b''
+        last_data = time.monotonic()
+        while True:
+            line = ser.readline()
+            if not line:
+                if time.monotonic() - last_data > 30:
+                    print("⚠️ Timed out waiting for the install to finish")
+                    break
+                continue
+            last_data = time.monotonic()
+            output += line
+            if line.rstrip() == b'>>>':  # bare prompt, not the echoed command
+                break
+        
+        response = output.decode('utf-8', errors='ignore')
         print(f"Installation output: {response}")
         
         ser.close()
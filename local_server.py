@@ -7,6 +7,8 @@ Serves the public/ directory on localhost for testing
 import http.server
 import socketserver
 import os
+import gzip
+import shutil
 import webbrowser
 import time
 from threading import Thread
@@ -14,9 +16,21 @@ from threading import Thread
 PORT = 8080
 DIRECTORY = "public"
 
+# Resolved once so each request skips the path conversion
+SERVE_ROOT = os.path.abspath(DIRECTORY)
+
+# Mirror GitHub Pages caching so the badge exercises its conditional-GET path
+CACHE_CONTROL = 'max-age=300, must-revalidate'
+GZIP_SUFFIXES = ('.json', '.txt')
+
+class Server(socketserver.ThreadingTCPServer):
+    """Serve each request on its own thread; restart without waiting on TIME_WAIT"""
+    allow_reuse_address = True
+    daemon_threads = True
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=DIRECTORY, **kwargs)
+        super().__init__(*args, directory=SERVE_ROOT, **kwargs)
     
     def end_headers(self):
         # Add CORS headers for local testing
@@ -24,10 +38,65 @@ class Handler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', '*')
         super().end_headers()
+    
+    def send_head(self):
+        """Serve files with an ETag, answering 304 and using .gz siblings when possible"""
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+        
+        body_path = path
+        gzipped = (path.endswith(GZIP_SUFFIXES) and os.path.isfile(path + '.gz')
+                   and 'gzip' in self.headers.get('Accept-Encoding', ''))
+        if gzipped:
+            body_path = path + '.gz'
+        
+        stat = os.stat(body_path)
+        etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+            self.end_headers()
+            return None
+        
+        f = open(body_path, 'rb')
+        self.send_response(200)
+        self.send_header('Content-Type', self.guess_type(path))
+        self.send_header('Content-Length', str(stat.st_size))
+        self.send_header('Last-Modified', self.date_time_string(stat.st_mtime))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        if path.endswith(GZIP_SUFFIXES):
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', CACHE_CONTROL)
+        self.end_headers()
+        return f
+    
+    def copyfile(self, source, outputfile):
+        """Send file bodies with sendfile(), copying in the kernel rather than through Python"""
+        outputfile.flush()
+        self.connection.sendfile(source)
+
+def gzip_public_files():
+    """Write .gz copies of the JSON/text payloads that are missing or stale"""
+    for root, _, files in os.walk(SERVE_ROOT):
+        for name in files:
+            if not name.endswith(GZIP_SUFFIXES):
+                continue
+            path = os.path.join(root, name)
+            gz_path = path + '.gz'
+            if os.path.exists(gz_path) and os.path.getmtime(gz_path) >= os.path.getmtime(path):
+                continue
+            with open(path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
 
 def start_server():
     """Start the local test server"""
-    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+    with Server(("", PORT), Handler) as httpd:
         print(f"🌐 Local GitHub Pages server running at:")
         print(f"   http://localhost:{PORT}/")
         print(f"   Badge data: http://localhost:{PORT}/api/badge_compact.json")
@@ -50,4 +119,5 @@ if __name__ == "__main__":
         print("Run 'python scripts/generate_badge_data.py' first")
         exit(1)
     
+    gzip_public_files()
     start_server()
@@ -3,9 +3,12 @@
 
 import badger2040
 from badger2040 import WIDTH, HEIGHT
-import urequests
+from badge_http import Session, resolve_url
+import badge_ui
+from badge_ui import display
 import time
 import json
+import struct
 import gc
 
 # Try to import QR code module
@@ -26,24 +29,68 @@ except ImportError:
 
 # Data URL
 DATA_URL = f"https://{USERNAME}.github.io/{REPO_NAME}/api/badge_compact.json"
-FALLBACK_URL = f"https://{USERNAME}.github.io/{REPO_NAME}/api/badge_simple.txt"
+FALLBACK_URL = f"https://{USERNAME}.github.io/{REPO_NAME}/api/badge_packed.bin"
+
+# Packed fallback header: repos, followers, stars, forks, name length, username length
+PACKED_HEADER = "<IIIIII"
+PACKED_HEADER_SIZE = struct.calcsize(PACKED_HEADER)
 
 # Pages
 PAGES = ["overview", "stats", "activity", "qr"]
 current_page = 0
 
-# Cache
-cache = {"data": None, "timestamp": 0}
+# Cache; etag/etag_url let the next fetch of the same URL be conditional
+cache = {"data": None, "timestamp": 0, "etag": None, "etag_url": None}
+
+# Fixed label prefixes; only the value is converted with str() at draw time
+REPOS_PREFIX = "Repos: "
+STARS_PREFIX = "Stars: "
+FOLLOWERS_PREFIX = "Followers: "
+FORKS_PREFIX = "Forks: "
+TOTAL_REPOS_PREFIX = "Total Repos: "
+TOTAL_STARS_PREFIX = "Total Stars: "
+TOTAL_FORKS_PREFIX = "Total Forks: "
+BULLET_PREFIX = "• "
 
-# Display
-display = badger2040.Badger2040()
-display.led(128)
-display.set_update_speed(badger2040.UPDATE_FAST)
-display.connect()
+# Footer wording for the shared page chrome
+badge_ui.set_footer_labels("Cached: ", "No data cached")
 
 if HAS_QRCODE:
     qr_code = qrcode.QRCode()
 
+# Encoded QR modules packed 1 bit each (row-major), kept until the URL changes
+qr_cache = {"url": None, "bits": None, "size": 0}
+
+# One keep-alive connection to GitHub Pages, shared by the data and fallback fetches
+session = Session()
+
+# Look up GitHub Pages once the display has brought Wi-Fi up; reconnects reuse the address
+resolve_url(DATA_URL)
+
+
+def read_exact(stream, size):
+    """Read size bytes from stream, or fewer only if the body ends first"""
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def conditional_headers(url):
+    """If-None-Match for url when the cached data came from it, else None"""
+    if cache["data"] and cache["etag"] and cache["etag_url"] == url:
+        return {"If-None-Match": cache["etag"]}
+    return None
+
+
+def store_etag(url, response):
+    """Remember the ETag of the response the cached data was built from"""
+    cache["etag"] = response.headers.get("etag")
+    cache["etag_url"] = url
+
 
 def fetch_data():
     """Fetch and cache data from GitHub Pages"""
@@ -51,10 +98,18 @@ def fetch_data():
     
     try:
         print("Fetching data...")
-        response = urequests.get(DATA_URL, timeout=10)
+        gc.collect()
+        response = session.get(DATA_URL, headers=conditional_headers(DATA_URL), timeout=10)
+        if response.status_code == 304:
+            # Unchanged since the cached copy; no body was sent
+            cache["timestamp"] = time.time()
+            print("✓ Data unchanged")
+            response.close()
+            return True
         if response.status_code == 200:
             cache["data"] = response.json()
             cache["timestamp"] = time.time()
+            store_etag(DATA_URL, response)
             print("✓ Data cached")
             response.close()
             return True
@@ -62,27 +117,37 @@ def fetch_data():
     except Exception as e:
         print(f"Fetch error: {e}")
     
-    # Fallback to simple text
+    # Fallback to the fixed-layout binary summary
     try:
-        response = urequests.get(FALLBACK_URL, timeout=10)
+        gc.collect()
+        response = session.get(FALLBACK_URL, headers=conditional_headers(FALLBACK_URL), timeout=10, stream=True)
+        if response.status_code == 304:
+            cache["timestamp"] = time.time()
+            print("✓ Fallback data unchanged")
+            response.close()
+            return True
         if response.status_code == 200:
-            lines = response.text.strip().split('\n')
-            if len(lines) >= 6:
+            header = read_exact(response.stream, PACKED_HEADER_SIZE)
+            if len(header) == PACKED_HEADER_SIZE:
+                repos, followers, stars, forks, name_len, user_len = struct.unpack_from(PACKED_HEADER, header)
+                name = read_exact(response.stream, name_len).decode()
+                username = read_exact(response.stream, user_len).decode()
                 cache["data"] = {
                     'profile': {
-                        'username': lines[0],
-                        'name': lines[1], 
-                        'public_repos': int(lines[2]),
-                        'followers': int(lines[3]),
-                        'html_url': f'https://github.com/{lines[0]}'
+                        'username': username,
+                        'name': name,
+                        'public_repos': repos,
+                        'followers': followers,
+                        'html_url': f'https://github.com/{username}'
                     },
                     'stats': {
-                        'total_stars': int(lines[4]),
-                        'total_forks': int(lines[5])
+                        'total_stars': stars,
+                        'total_forks': forks
                     },
                     'activity': []
                 }
                 cache["timestamp"] = time.time()
+                store_etag(FALLBACK_URL, response)
                 print("✓ Fallback data cached")
                 response.close()
                 return True
@@ -93,53 +158,26 @@ def fetch_data():
     return False
 
 
-def draw_header(title):
-    """Draw header"""
-    display.set_pen(0)
-    display.rectangle(0, 0, WIDTH, 20)
-    display.set_pen(15)
-    display.set_font("bitmap8")
-    display.text("GitHub", 4, 6, WIDTH, 1)
-    
-    # Page indicator
-    indicator = f"{current_page + 1}/{len(PAGES)}"
-    display.text(indicator, WIDTH - 30, 6, WIDTH, 1)
-    
-    # Title
-    display.set_font("bitmap6")
-    title_width = display.measure_text(title, 1)
-    display.text(title, (WIDTH - title_width) // 2, 6, WIDTH, 1)
+def begin_page(title, full=False):
+    """Clear the panel, draw the header and return the cached data (None if empty)"""
+    badge_ui.begin_page(title, current_page, len(PAGES), full)
+    return cache["data"]
 
 
-def draw_footer():
-    """Draw status footer"""
-    display.set_pen(0)
-    display.set_font("bitmap6")
-    
-    if cache["timestamp"] > 0:
-        age = int((time.time() - cache["timestamp"]) / 60)
-        status = f"Cached: {age}m ago" if age < 60 else f"Cached: {age//60}h ago"
-    else:
-        status = "No data cached"
-    
-    display.text(status, 5, HEIGHT - 10, WIDTH, 1)
+def end_page(message=None):
+    """Draw an optional placeholder message and the footer, then push the frame"""
+    badge_ui.end_page(cache["timestamp"], message)
 
 
 def draw_overview():
     """Draw overview page"""
-    display.set_pen(15)
-    display.clear()
-    draw_header("Overview")
-    
-    if not cache["data"]:
-        display.set_pen(0)
-        display.text("No data - Press A to update", 5, 50, WIDTH, 1)
-        draw_footer()
-        display.update()
+    data = begin_page("Overview")
+    if not data:
+        end_page("No data - Press A to update")
         return
     
-    profile = cache["data"].get("profile", {})
-    stats = cache["data"].get("stats", {})
+    profile = data.get("profile", {})
+    stats = data.get("stats", {})
     
     display.set_pen(0)
     y = 25
@@ -151,36 +189,29 @@ def draw_overview():
     y += 15
     
     display.set_font("bitmap6")
-    display.text(f"@{profile.get('username', USERNAME)}", 5, y, WIDTH, 1)
+    display.text("@" + profile.get('username', USERNAME), 5, y, WIDTH, 1)
     y += 15
     
     # Stats
-    display.text(f"Repos: {profile.get('public_repos', 0)}", 5, y, WIDTH//2, 1)
-    display.text(f"Stars: {stats.get('total_stars', 0)}", WIDTH//2, y, WIDTH//2, 1)
+    display.text(REPOS_PREFIX + str(profile.get('public_repos', 0)), 5, y, WIDTH//2, 1)
+    display.text(STARS_PREFIX + str(stats.get('total_stars', 0)), WIDTH//2, y, WIDTH//2, 1)
     y += 12
     
-    display.text(f"Followers: {profile.get('followers', 0)}", 5, y, WIDTH//2, 1)
-    display.text(f"Forks: {stats.get('total_forks', 0)}", WIDTH//2, y, WIDTH//2, 1)
+    display.text(FOLLOWERS_PREFIX + str(profile.get('followers', 0)), 5, y, WIDTH//2, 1)
+    display.text(FORKS_PREFIX + str(stats.get('total_forks', 0)), WIDTH//2, y, WIDTH//2, 1)
     
-    draw_footer()
-    display.update()
+    end_page()
 
 
 def draw_stats():
     """Draw stats page"""
-    display.set_pen(15)
-    display.clear()
-    draw_header("Statistics")
-    
-    if not cache["data"]:
-        display.set_pen(0)
-        display.text("No stats available", 5, 50, WIDTH, 1)
-        draw_footer()
-        display.update()
+    data = begin_page("Statistics")
+    if not data:
+        end_page("No stats available")
         return
     
-    profile = cache["data"].get("profile", {})
-    stats = cache["data"].get("stats", {})
+    profile = data.get("profile", {})
+    stats = data.get("stats", {})
     
     display.set_pen(0)
     y = 25
@@ -190,11 +221,11 @@ def draw_stats():
     y += 15
     
     display.set_font("bitmap6")
-    display.text(f"Total Repos: {profile.get('public_repos', 0)}", 5, y, WIDTH, 1)
+    display.text(TOTAL_REPOS_PREFIX + str(profile.get('public_repos', 0)), 5, y, WIDTH, 1)
     y += 12
-    display.text(f"Total Stars: {stats.get('total_stars', 0)}", 5, y, WIDTH, 1)
+    display.text(TOTAL_STARS_PREFIX + str(stats.get('total_stars', 0)), 5, y, WIDTH, 1)
     y += 12
-    display.text(f"Total Forks: {stats.get('total_forks', 0)}", 5, y, WIDTH, 1)
+    display.text(TOTAL_FORKS_PREFIX + str(stats.get('total_forks', 0)), 5, y, WIDTH, 1)
     y += 15
     
     # Most starred repo
@@ -203,29 +234,22 @@ def draw_stats():
         display.text("Most Starred:", 5, y, WIDTH, 1)
         y += 12
         repo_name = most_starred.get('name', 'Unknown')[:25]
-        display.text(f"• {repo_name}", 5, y, WIDTH, 1)
+        display.text(BULLET_PREFIX + repo_name, 5, y, WIDTH, 1)
         y += 12
         stars = most_starred.get('stargazers_count', 0)
-        display.text(f"  {stars} stars", 5, y, WIDTH, 1)
+        display.text("  " + str(stars) + " stars", 5, y, WIDTH, 1)
     
-    draw_footer()
-    display.update()
+    end_page()
 
 
 def draw_activity():
     """Draw activity page"""
-    display.set_pen(15)
-    display.clear()
-    draw_header("Activity")
-    
-    if not cache["data"]:
-        display.set_pen(0)
-        display.text("No activity data", 5, 50, WIDTH, 1)
-        draw_footer()
-        display.update()
+    data = begin_page("Activity")
+    if not data:
+        end_page("No activity data")
         return
     
-    activity = cache["data"].get("activity", [])
+    activity = data.get("activity", [])
     
     display.set_pen(0)
     y = 25
@@ -243,36 +267,48 @@ def draw_activity():
             if y > HEIGHT - 25:
                 break
             text = event.get('display', 'Event')[:35]
-            display.text(f"• {text}", 5, y, WIDTH, 1)
+            display.text(BULLET_PREFIX + text, 5, y, WIDTH, 1)
             y += 12
     
-    draw_footer()
-    display.update()
+    end_page()
+
+
+def get_qr_bits(url):
+    """Return (bits, size) for url, encoding the QR code only when url changes"""
+    if qr_cache["url"] != url:
+        gc.collect()
+        qr_code.set_text(url)
+        w, h = qr_code.get_size()
+        bits = bytearray((w * h + 7) // 8)
+        i = 0
+        for y in range(h):
+            for x in range(w):
+                if qr_code.get_module(x, y):
+                    bits[i >> 3] |= 1 << (i & 7)
+                i += 1
+        qr_cache["url"] = url
+        qr_cache["bits"] = bits
+        qr_cache["size"] = w
+    
+    return qr_cache["bits"], qr_cache["size"]
 
 
 def draw_qr():
     """Draw QR code page"""
-    display.set_pen(15)
-    display.clear()
-    draw_header("QR Code")
-    
+    data = begin_page("QR Code", full=True)
     if not HAS_QRCODE:
-        display.set_pen(0)
-        display.text("QR module not available", 5, 50, WIDTH, 1)
-        draw_footer()
-        display.update()
+        end_page("QR module not available")
         return
     
     # Get GitHub URL
-    if cache["data"]:
-        github_url = cache["data"].get("profile", {}).get('html_url', f'https://github.com/{USERNAME}')
+    if data:
+        github_url = data.get("profile", {}).get('html_url', f'https://github.com/{USERNAME}')
     else:
         github_url = f'https://github.com/{USERNAME}'
     
-    # Generate and draw QR code
-    qr_code.set_text(github_url)
+    # Generate (or reuse) and draw QR code
+    bits, w = get_qr_bits(github_url)
     
-    w, h = qr_code.get_size()
     qr_size = 80
     module_size = qr_size // w
     qr_x = (WIDTH - qr_size) // 2
@@ -281,14 +317,22 @@ def draw_qr():
     # Background
     display.rectangle(qr_x - 2, qr_y - 2, qr_size + 4, qr_size + 4)
     
-    # QR modules
+    # QR modules, one rectangle per horizontal run of dark modules
     display.set_pen(0)
-    for y in range(h):
+    i = 0
+    for y in range(w):
+        py = qr_y + y * module_size
+        run_start = -1
         for x in range(w):
-            if qr_code.get_module(x, y):
-                px = qr_x + x * module_size
-                py = qr_y + y * module_size
-                display.rectangle(px, py, module_size, module_size)
+            if bits[i >> 3] & (1 << (i & 7)):
+                if run_start < 0:
+                    run_start = x
+            elif run_start >= 0:
+                display.rectangle(qr_x + run_start * module_size, py, (x - run_start) * module_size, module_size)
+                run_start = -1
+            i += 1
+        if run_start >= 0:
+            display.rectangle(qr_x + run_start * module_size, py, (w - run_start) * module_size, module_size)
     
     # URL text
     display.set_font("bitmap6")
@@ -296,21 +340,16 @@ def draw_qr():
     url_width = display.measure_text(url_text, 1)
     display.text(url_text, (WIDTH - url_width) // 2, HEIGHT - 20, WIDTH, 1)
     
-    draw_footer()
-    display.update()
+    end_page()
+
+
+# Page draw functions in PAGES order, indexed directly by current_page
+PAGE_DRAWERS = (draw_overview, draw_stats, draw_activity, draw_qr)
 
 
 def draw_page():
     """Draw current page"""
-    page = PAGES[current_page]
-    if page == "overview":
-        draw_overview()
-    elif page == "stats":
-        draw_stats()
-    elif page == "activity":
-        draw_activity()
-    elif page == "qr":
-        draw_qr()
+    PAGE_DRAWERS[current_page]()
 
 
 def update_display():
@@ -320,7 +359,11 @@ def update_display():
     display.set_pen(0)
     display.set_font("bitmap8")
     display.text("Updating...", 5, 50, WIDTH, 1)
+    
+    # Let the TCP handshake run while the panel refreshes
+    session.preconnect(DATA_URL)
     display.update()
+    badge_ui.invalidate_panel()
     
     success = fetch_data()
     
@@ -338,6 +381,11 @@ def update_display():
     draw_page()
 
 
+# Buttons that leave the cache info screen
+CACHE_INFO_EXIT_BUTTONS = (badger2040.BUTTON_UP, badger2040.BUTTON_DOWN,
+                           badger2040.BUTTON_A, badger2040.BUTTON_B)
+
+
 def main():
     """Main loop"""
     global current_page
@@ -352,7 +400,10 @@ def main():
     display.text("GitHub Badge", 5, 40, WIDTH, 1)
     display.set_font("bitmap6")
     display.text("Loading...", 5, 60, WIDTH, 1)
+    if not cache["data"]:
+        session.preconnect(DATA_URL)
     display.update()
+    badge_ui.invalidate_panel()
     
     # Initial fetch
     if not cache["data"]:
@@ -403,19 +454,15 @@ def main():
                     display.text("No cache", 5, 50, WIDTH, 1)
                 display.text("Press any button", 5, 85, WIDTH, 1)
                 display.update()
+                badge_ui.invalidate_panel()
                 
                 # Wait for button
-                while not any([display.pressed(badger2040.BUTTON_UP),
-                              display.pressed(badger2040.BUTTON_DOWN),
-                              display.pressed(badger2040.BUTTON_A),
-                              display.pressed(badger2040.BUTTON_B)]):
-                    time.sleep(0.1)
+                badge_ui.wait_for_button(CACHE_INFO_EXIT_BUTTONS)
                 
                 draw_page()
                 time.sleep(0.2)
             
             time.sleep(0.05)
-            gc.collect()
             
     except KeyboardInterrupt:
         print("Shutting down...")
@@ -3,7 +3,9 @@
 
 import badger2040
 from badger2040 import WIDTH, HEIGHT
-import urequests
+from badge_http import Session, resolve_url
+import badge_ui
+from badge_ui import display
 import time
 import json
 import gc
@@ -21,6 +23,7 @@ USERNAME = "Julian-Elliott"
 # Test URLs using public GitHub API
 API_BASE = "https://api.github.com"
 USER_URL = f"{API_BASE}/users/{USERNAME}"
+REPOS_URL = f"{API_BASE}/users/{USERNAME}/repos?per_page=100"
 
 print(f"🌐 Testing with GitHub API:")
 print(f"   User URL: {USER_URL}")
@@ -32,15 +35,109 @@ current_page = 0
 # Cache
 cache = {"data": None, "timestamp": 0}
 
-# Display
-display = badger2040.Badger2040()
-display.led(128)
-display.set_update_speed(badger2040.UPDATE_FAST)
-display.connect()
+# ETag of the last 200 response per URL, sent back as If-None-Match
+etags = {}
+
+# Per-page rendered text, rebuilt only when data changes
+render_cache = {}
+
+# Set whenever the page or data changes; the main loop only redraws when it is set
+dirty = True
+
+# Footer wording for the shared page chrome
+badge_ui.set_footer_labels("API: ", "No data")
 
 if HAS_QRCODE:
     qr_code = qrcode.QRCode()
 
+# Encoded QR modules packed 1 bit each (row-major), kept until the URL changes
+qr_cache = {"url": None, "bits": None, "size": 0}
+
+# One keep-alive connection to api.github.com, so /repos reuses the /users TLS session
+session = Session()
+
+# Look up api.github.com once the display has brought Wi-Fi up; reconnects reuse the address
+resolve_url(API_BASE)
+
+def sum_repo_counts(stream):
+    """Total stargazers_count and forks_count from a streamed /repos body
+    
+    Scans 256-byte chunks for the two keys instead of building the list of
+    repo dicts, so peak memory stays at a few hundred bytes.
+    """
+    stars = forks = 0
+    data = b""
+    while True:
+        chunk = stream.read(256)
+        data += chunk
+        n = len(data)
+        pos = 0
+        keep = -1
+        while True:
+            i = data.find(b'_count"', pos)
+            if i < 0:
+                break
+            
+            # Skip ": " and read the digits that follow the key
+            j = i + 7
+            while j < n and data[j] in (32, 58):
+                j += 1
+            k = j
+            while k < n and 48 <= data[k] <= 57:
+                k += 1
+            if k == n and chunk:
+                # Value may continue in the next chunk
+                keep = max(pos, i - 11)
+                break
+            
+            if k > j:
+                if i >= 11 and data[i - 11:i] == b'"stargazers':
+                    stars += int(data[j:k])
+                elif i >= 6 and data[i - 6:i] == b'"forks':
+                    forks += int(data[j:k])
+            pos = k
+        
+        if not chunk:
+            return stars, forks
+        
+        # Carry over just enough to complete a key split across reads
+        if keep < 0:
+            keep = max(pos, n - 24)
+        data = data[keep:]
+
+
+def conditional_headers(url, headers):
+    """Copy of headers with If-None-Match added when url has a stored ETag"""
+    etag = etags.get(url)
+    if not etag:
+        return headers
+    headers = dict(headers)
+    headers['If-None-Match'] = etag
+    return headers
+
+def fetch_repo_stats(headers):
+    """Total stars and forks across the user's repos, skipped when unchanged"""
+    try:
+        print("🔄 Fetching repositories...")
+        
+        gc.collect()
+        repos_response = session.get(REPOS_URL, headers=conditional_headers(REPOS_URL, headers), timeout=15, stream=True)
+        if repos_response.status_code == 304:
+            print("✅ Repository stats unchanged")
+        elif repos_response.status_code == 200:
+            total_stars, total_forks = sum_repo_counts(repos_response.stream)
+            
+            cache["data"]["stats"]["total_stars"] = total_stars
+            cache["data"]["stats"]["total_forks"] = total_forks
+            etags[REPOS_URL] = repos_response.headers.get('etag')
+            invalidate_pages()
+            print(f"✅ Repository stats: {total_stars} stars, {total_forks} forks")
+        
+        repos_response.close()
+        
+    except Exception as e:
+        print(f"⚠️ Repo stats error: {e}")
+
 def fetch_github_data():
     """Fetch data directly from GitHub API"""
     global cache
@@ -53,10 +150,19 @@ def fetch_github_data():
             'Accept': 'application/vnd.github.v3+json'
         }
         
-        response = urequests.get(USER_URL, headers=headers, timeout=15)
+        gc.collect()
+        response = session.get(USER_URL, headers=conditional_headers(USER_URL, headers), timeout=15)
         print(f"📡 Response status: {response.status_code}")
         
-        if response.status_code == 200:
+        if response.status_code == 304:
+            # Unchanged since the cached copy; 304s don't count against the rate limit
+            cache["timestamp"] = time.time()
+            print("✅ GitHub API data unchanged")
+            response.close()
+            fetch_repo_stats(headers)
+            return True
+            
+        elif response.status_code == 200:
             user_data = response.json()
             
             # Create simplified badge data structure
@@ -76,28 +182,15 @@ def fetch_github_data():
             }
             
             cache["timestamp"] = time.time()
+            etags[USER_URL] = response.headers.get('etag')
+            # Stats were reset above, so the repos must be downloaded again
+            etags.pop(REPOS_URL, None)
+            invalidate_pages()
             print("✅ GitHub API data cached successfully")
             response.close()
             
             # Try to fetch repo data for stars count
-            try:
-                repos_url = f"{API_BASE}/users/{USERNAME}/repos?per_page=100"
-                print("🔄 Fetching repositories...")
-                
-                repos_response = urequests.get(repos_url, headers=headers, timeout=15)
-                if repos_response.status_code == 200:
-                    repos = repos_response.json()
-                    total_stars = sum(repo.get('stargazers_count', 0) for repo in repos)
-                    total_forks = sum(repo.get('forks_count', 0) for repo in repos)
-                    
-                    cache["data"]["stats"]["total_stars"] = total_stars
-                    cache["data"]["stats"]["total_forks"] = total_forks
-                    print(f"✅ Repository stats: {total_stars} stars, {total_forks} forks")
-                
-                repos_response.close()
-                
-            except Exception as e:
-                print(f"⚠️ Repo stats error: {e}")
+            fetch_repo_stats(headers)
             
             return True
             
@@ -116,56 +209,50 @@ def fetch_github_data():
         print(f"❌ Fetch error: {e}")
         return False
 
-def draw_header(title):
-    """Draw header"""
-    display.set_pen(0)
-    display.rectangle(0, 0, WIDTH, 20)
-    display.set_pen(15)
-    display.set_font("bitmap8")
-    display.text("GitHub", 4, 6, WIDTH, 1)
-    
-    # Page indicator
-    indicator = f"{current_page + 1}/{len(PAGES)}"
-    display.text(indicator, WIDTH - 30, 6, WIDTH, 1)
-    
-    # Title
-    display.set_font("bitmap6")
-    title_width = display.measure_text(title, 1)
-    display.text(title, (WIDTH - title_width) // 2, 6, WIDTH, 1)
+def invalidate_pages():
+    """Drop rendered page text and request a redraw"""
+    global dirty
+    render_cache.clear()
+    dirty = True
 
 def draw_footer():
     """Draw status footer"""
-    display.set_pen(0)
-    display.set_font("bitmap6")
-    
-    if cache["timestamp"] > 0:
-        age = int((time.time() - cache["timestamp"]) / 60)
-        status = f"API: {age}m ago" if age < 60 else f"API: {age//60}h ago"
-    else:
-        status = "No data"
-    
-    display.text(status, 4, HEIGHT - 12, WIDTH, 1)
+    badge_ui.draw_footer(cache["timestamp"])
 
-def draw_overview_page():
-    """Draw overview page"""
-    display.set_pen(15)
-    display.clear()
+def begin_page(title, full=False):
+    """Clear the panel, draw the header and return the cached data (None if empty)"""
+    badge_ui.begin_page(title, current_page, len(PAGES), full)
+    return cache["data"]
+
+def draw_cached_page(page_name, title, build_lines):
+    """Draw a text page from its (font, text, x, y) tuples, building them once per data change"""
+    begin_page(title)
     
-    draw_header("Overview")
+    lines = render_cache.get(page_name)
+    if lines is None:
+        lines = render_cache[page_name] = build_lines()
     
+    display.set_pen(0)
+    font = None
+    for line_font, text, x, y in lines:
+        if line_font != font:
+            display.set_font(line_font)
+            font = line_font
+        display.text(text, x, y, WIDTH, 1)
+    
+    draw_footer()
+
+def overview_lines():
+    """Text for the overview page"""
     if not cache["data"]:
-        display.set_font("bitmap8")
-        display.text("Loading...", 20, 50, WIDTH, 1)
-        display.text("Fetching GitHub data", 20, 70, WIDTH, 1)
-        draw_footer()
-        return
+        return [
+            ("bitmap8", "Loading...", 20, 50),
+            ("bitmap8", "Fetching GitHub data", 20, 70)
+        ]
     
     profile = cache["data"].get("profile", {})
     stats = cache["data"].get("stats", {})
     
-    y = 30
-    display.set_font("bitmap8")
-    
     # Name and username
     name = profile.get("name", "Unknown")
     username = profile.get("username", "unknown")
@@ -174,103 +261,86 @@ def draw_overview_page():
     if len(name) > 20:
         name = name[:17] + "..."
     
-    display.text(f"{name}", 10, y, WIDTH, 1)
-    y += 15
-    display.text(f"@{username}", 10, y, WIDTH, 1)
-    y += 20
-    
-    # Stats
-    display.set_font("bitmap6")
-    repos = profile.get("public_repos", 0)
-    followers = profile.get("followers", 0)
-    following = profile.get("following", 0)
-    stars = stats.get("total_stars", 0)
-    forks = stats.get("total_forks", 0)
-    
-    display.text(f"Repos: {repos}", 10, y, WIDTH, 1)
-    y += 12
-    display.text(f"Followers: {followers}", 10, y, WIDTH, 1)
-    y += 12
-    display.text(f"Following: {following}", 10, y, WIDTH, 1)
-    y += 12
-    display.text(f"Stars: {stars}", 10, y, WIDTH, 1)
-    
-    draw_footer()
+    return [
+        ("bitmap8", f"{name}", 10, 30),
+        ("bitmap8", f"@{username}", 10, 45),
+        # Stats
+        ("bitmap6", f"Repos: {profile.get('public_repos', 0)}", 10, 65),
+        ("bitmap6", f"Followers: {profile.get('followers', 0)}", 10, 77),
+        ("bitmap6", f"Following: {profile.get('following', 0)}", 10, 89),
+        ("bitmap6", f"Stars: {stats.get('total_stars', 0)}", 10, 101)
+    ]
 
-def draw_test_page():
-    """Draw API test results page"""
-    display.set_pen(15)
-    display.clear()
-    
-    draw_header("API Test")
-    
-    y = 30
-    display.set_font("bitmap6")
-    
-    display.text("GitHub API Test:", 10, y, WIDTH, 1)
-    y += 15
+def test_lines():
+    """Text for the API test results page"""
+    lines = [("bitmap6", "GitHub API Test:", 10, 30)]
     
     if cache["data"]:
         profile = cache["data"].get("profile", {})
-        
-        display.text("✓ API connection OK", 10, y, WIDTH, 1)
-        y += 12
-        
-        username = profile.get("username", "unknown")
-        display.text(f"✓ User: {username}", 10, y, WIDTH, 1)
-        y += 12
-        
-        repos = profile.get("public_repos", 0)
-        display.text(f"✓ Repos: {repos}", 10, y, WIDTH, 1)
-        y += 12
-        
-        followers = profile.get("followers", 0)
-        display.text(f"✓ Followers: {followers}", 10, y, WIDTH, 1)
-        
+        lines += [
+            ("bitmap6", "✓ API connection OK", 10, 45),
+            ("bitmap6", f"✓ User: {profile.get('username', 'unknown')}", 10, 57),
+            ("bitmap6", f"✓ Repos: {profile.get('public_repos', 0)}", 10, 69),
+            ("bitmap6", f"✓ Followers: {profile.get('followers', 0)}", 10, 81)
+        ]
     else:
-        display.text("✗ API connection failed", 10, y, WIDTH, 1)
-        y += 12
-        display.text("Check network & rate limits", 10, y, WIDTH, 1)
+        lines += [
+            ("bitmap6", "✗ API connection failed", 10, 45),
+            ("bitmap6", "Check network & rate limits", 10, 57)
+        ]
     
-    draw_footer()
+    return lines
+
+def api_info_lines():
+    """Text for the API information page"""
+    return [
+        ("bitmap6", "Data Source:", 10, 30),
+        ("bitmap6", "GitHub REST API v3", 10, 42),
+        ("bitmap6", "Endpoints:", 10, 57),
+        ("bitmap6", "/users/{username}", 10, 69),
+        ("bitmap6", "/users/{username}/repos", 10, 81),
+        ("bitmap6", "Status:", 10, 96),
+        ("bitmap6", "✓ Connected" if cache["data"] else "✗ No data", 10, 108)
+    ]
+
+def draw_overview_page():
+    """Draw overview page"""
+    draw_cached_page("overview", "Overview", overview_lines)
+
+def draw_test_page():
+    """Draw API test results page"""
+    draw_cached_page("test", "API Test", test_lines)
 
 def draw_api_info_page():
     """Draw API information page"""
-    display.set_pen(15)
-    display.clear()
-    
-    draw_header("API Info")
-    
-    y = 30
-    display.set_font("bitmap6")
-    
-    display.text("Data Source:", 10, y, WIDTH, 1)
-    y += 12
-    display.text("GitHub REST API v3", 10, y, WIDTH, 1)
-    y += 15
-    
-    display.text("Endpoints:", 10, y, WIDTH, 1)
-    y += 12
-    display.text("/users/{username}", 10, y, WIDTH, 1)
-    y += 12
-    display.text("/users/{username}/repos", 10, y, WIDTH, 1)
-    y += 15
-    
-    display.text("Status:", 10, y, WIDTH, 1)
-    y += 12
-    if cache["data"]:
-        display.text("✓ Connected", 10, y, WIDTH, 1)
-    else:
-        display.text("✗ No data", 10, y, WIDTH, 1)
+    draw_cached_page("api", "API Info", api_info_lines)
+
+def get_qr_bits(url):
+    """Return (bits, size) for url, encoding the QR code only when url changes"""
+    if qr_cache["url"] != url:
+        gc.collect()
+        qr_code.clear()
+        qr_code.add_data(url)
+        qr_code.make()
+        qr_matrix = qr_code.get_matrix()
+        size = len(qr_matrix)
+        bits = bytearray((size * size + 7) // 8)
+        i = 0
+        for row in qr_matrix:
+            for pixel in row:
+                if pixel:
+                    bits[i >> 3] |= 1 << (i & 7)
+                i += 1
+        qr_cache["url"] = url
+        qr_cache["bits"] = bits
+        qr_cache["size"] = size
     
-    draw_footer()
+    return qr_cache["bits"], qr_cache["size"]
+
 
 def draw_qr_page():
     """Draw QR code page"""
-    display.set_pen(15)
-    display.clear()
-    
-    draw_header("QR Code")
+    data = begin_page("QR Code", full=True)
     
     if not HAS_QRCODE:
         display.set_font("bitmap8")
@@ -279,38 +349,44 @@ def draw_qr_page():
         draw_footer()
         return
     
-    if not cache["data"]:
+    if not data:
         display.set_font("bitmap8")
         display.text("No profile data", 20, 50, WIDTH, 1)
         draw_footer()
         return
     
-    profile = cache["data"].get("profile", {})
+    profile = data.get("profile", {})
     github_url = profile.get("html_url", f"https://github.com/{USERNAME}")
     
     try:
-        # Generate QR code
-        qr_code.clear()
-        qr_code.add_data(github_url)
-        qr_code.make()
+        # Generate QR code (reused while the URL is unchanged)
+        bits, qr_size = get_qr_bits(github_url)
         
         # Draw QR code
         size = 2
-        qr_matrix = qr_code.get_matrix()
-        qr_size = len(qr_matrix)
         
         start_x = (WIDTH - qr_size * size) // 2
         start_y = 25
         
         display.set_pen(0)
-        for y, row in enumerate(qr_matrix):
-            for x, pixel in enumerate(row):
-                if pixel:
+        # One rectangle per horizontal run of dark modules
+        i = 0
+        for y in range(qr_size):
+            run_start = -1
+            for x in range(qr_size + 1):
+                dark = x < qr_size and bits[i >> 3] & (1 << (i & 7))
+                if dark:
+                    if run_start < 0:
+                        run_start = x
+                elif run_start >= 0:
                     display.rectangle(
-                        start_x + x * size,
+                        start_x + run_start * size,
                         start_y + y * size,
-                        size, size
+                        (x - run_start) * size, size
                     )
+                    run_start = -1
+                if x < qr_size:
+                    i += 1
         
         # Draw URL below QR code
         display.set_font("bitmap6")
@@ -324,9 +400,16 @@ def draw_qr_page():
     
     draw_footer()
 
+# Page draw functions in PAGES order, indexed directly by current_page
+PAGE_DRAWERS = (draw_overview_page, draw_test_page, draw_api_info_page, draw_qr_page)
+
+# Buttons polled by the main loop, in the order main() indexes them
+POLLED_BUTTONS = (badger2040.BUTTON_A, badger2040.BUTTON_B, badger2040.BUTTON_C,
+                  badger2040.BUTTON_UP, badger2040.BUTTON_DOWN)
+
 def main():
     """Main application loop"""
-    global current_page
+    global current_page, dirty
     
     print("🦡 Starting GitHub Badge Application")
     print("====================================")
@@ -336,32 +419,29 @@ def main():
     fetch_github_data()
     
     last_update = time.time()
-    button_states = [False, False, False, False, False]
+    button_states = (False, False, False, False, False)
     
     while True:
         # Check buttons
-        buttons = [
-            display.pressed(badger2040.BUTTON_A),
-            display.pressed(badger2040.BUTTON_B), 
-            display.pressed(badger2040.BUTTON_C),
-            display.pressed(badger2040.BUTTON_UP),
-            display.pressed(badger2040.BUTTON_DOWN)
-        ]
+        buttons = badge_ui.read_buttons(POLLED_BUTTONS)
         
         # Button A - Previous page
         if buttons[0] and not button_states[0]:
             current_page = (current_page - 1) % len(PAGES)
+            dirty = True
             print(f"📄 Page: {PAGES[current_page]}")
             
         # Button B - Next page  
         elif buttons[1] and not button_states[1]:
             current_page = (current_page + 1) % len(PAGES)
+            dirty = True
             print(f"📄 Page: {PAGES[current_page]}")
             
         # Button C - Refresh data
         elif buttons[2] and not button_states[2]:
             print("🔄 Manual refresh...")
             fetch_github_data()
+            dirty = True
             
         button_states = buttons
         
@@ -370,21 +450,15 @@ def main():
             print("🔄 Auto refresh...")
             fetch_github_data()
             last_update = time.time()
+            dirty = True
+        
+        # Draw current page, only when something changed
+        if dirty:
+            PAGE_DRAWERS[current_page]()
+            badge_ui.push_page()
+            dirty = False
         
-        # Draw current page
-        page_name = PAGES[current_page]
-        if page_name == "overview":
-            draw_overview_page()
-        elif page_name == "test":
-            draw_test_page()
-        elif page_name == "api":
-            draw_api_info_page()
-        elif page_name == "qr":
-            draw_qr_page()
-            
-        display.update()
         time.sleep(0.1)
-        gc.collect()
 
 if __name__ == "__main__":
     main()
@@ -2,18 +2,13 @@
 # Test version using local HTTP server
 
 import badger2040
-from badger2040 import WIDTH, HEIGHT
-import urequests
+from badger2040 import WIDTH
+from badge_http import Session
 import time
-import json
 import gc
-
-# Try to import QR code module
-try:
-    import qrcode
-    HAS_QRCODE = True
-except ImportError:
-    HAS_QRCODE = False
+import machine
+import micropython
+from micropython import const
 
 # Configuration for local testing
 LOCAL_SERVER_IP = "192.168.4.214"
@@ -31,36 +26,275 @@ print(f"   Data URL: {DATA_URL}")
 print(f"   Fallback URL: {FALLBACK_URL}")
 
 # Pages
-PAGES = ["overview", "stats", "activity", "qr"]
+_PAGES = ("overview", "stats", "activity", "qr")
 current_page = 0
 
-# Cache
-cache = {"data": None, "timestamp": 0}
+# Cached profile as flat module globals, read directly by the draw functions.
+# _username is None until the first successful fetch; _ts is its time.time().
+_username = None
+_name = None
+_repos = 0
+_followers = 0
+_stars = 0
+_forks = 0
+_ts = 0
+
+# Last footer text and the data age (in minutes, -1 for no data) it was built for
+_last_status = ""
+_last_status_min = -2
+
+# Set when the page, the data or the footer text changes; the panel is only refreshed then
+_dirty = True
+
+# Keys read from badge_compact.json, in the order fetch_data() unpacks them.
+# The first occurrence wins; the profile and stats objects come before activity.
+DATA_KEYS = (b'"username"', b'"name"', b'"public_repos"', b'"followers"',
+             b'"total_stars"', b'"total_forks"')
+
+# Lines of badge_simple.txt: username, name, repos, followers, following, stars, forks
+FALLBACK_LINES = 7
+
+# One keep-alive connection to the local server, shared by the data and fallback fetches
+session = Session()
 
 # Display
 display = badger2040.Badger2040()
 display.led(128)
-display.set_update_speed(badger2040.UPDATE_FAST)
+display.set_update_speed(badger2040.UPDATE_NORMAL)  # Turbo after the first clean paint
 display.connect()
 
-if HAS_QRCODE:
-    qr_code = qrcode.QRCode()
+# Button pins in EVT_* bit order; presses are latched into _evt by pin IRQs
+BUTTON_PINS = [machine.Pin(gpio, machine.Pin.IN, machine.Pin.PULL_DOWN)
+               for gpio in (badger2040.BUTTON_A, badger2040.BUTTON_B, badger2040.BUTTON_C,
+                            badger2040.BUTTON_UP, badger2040.BUTTON_DOWN)]
+EVT_A = const(1)
+EVT_B = const(2)
+EVT_C = const(4)
+_evt = 0
+
+# Auto refresh period, replaced by the server's Cache-Control max-age when it sends one
+REFRESH_MS = 300_000
+MIN_REFRESH_MS = 60_000
+_refresh_ms = REFRESH_MS
+
+# Validators of the response the cached profile came from, for conditional GETs
+_etag = None
+_last_modified = None
+_validator_url = None
+
+# Header, footer and debounce numbers, folded into the bytecode by const()
+_HEADER_H = const(20)
+_INDICATOR_X = const(266)  # WIDTH - 30
+_FOOTER_Y = const(116)  # HEIGHT - 12
+_DEBOUNCE_MS = const(200)
+
+# Text rows, folded into the bytecode by const() instead of summed at draw time
+_TEXT_X = const(10)
+_ROW_NAME = const(30)
+_ROW_USERNAME = const(45)
+_ROW_REPOS = const(65)
+_ROW_FOLLOWERS = const(77)
+_ROW_STARS = const(89)
+_ROW_TEST_TITLE = const(30)
+_ROW_TEST_1 = const(45)
+_ROW_TEST_2 = const(57)
+_ROW_TEST_3 = const(69)
+
+# Page indicators and centred title x positions, computed once
+PAGE_INDICATORS = tuple(f"{i + 1}/{len(_PAGES)}" for i in range(len(_PAGES)))
+title_positions = {}
+
+# QR encoder, imported on first use so qrcode stays off the heap until a QR is drawn.
+# None until then; False if the module is not installed.
+_qr_mod = None
+_qr_code = None
+
+# Body buffer reused by every fetch; scan_fields() reads into it with readinto()
+_buf = bytearray(1024)
+
+
+def parse_scalar(data, j, n):
+    """Parse the JSON string or integer starting at data[j], looking no further than n
+    
+    Returns (value, end); end is -1 if the value may continue past n.
+    Values other than strings and integers come back as None.
+    """
+    while j < n and data[j] in (32, 9, 10, 13):
+        j += 1
+    if j == n:
+        return None, -1
+    
+    if data[j] == 34:
+        # Find the closing quote, skipping escaped ones
+        k = j + 1
+        while True:
+            k = data.find(b'"', k, n)
+            if k < 0:
+                return None, -1
+            b = k - 1
+            while data[b] == 92:
+                b -= 1
+            if (k - 1 - b) % 2 == 0:
+                break
+            k += 1
+        if data.find(b"\\", j + 1, k) >= 0:
+            import json
+            return json.loads(bytes(data[j:k + 1])), k + 1
+        return str(data[j + 1:k], "utf-8"), k + 1
+    
+    # Integers are accumulated digit by digit so no token object is created
+    k = j
+    sign = 1
+    if data[k] == 45:
+        sign = -1
+        k += 1
+    value = 0
+    while k < n and 48 <= data[k] <= 57:
+        value = value * 10 + data[k] - 48
+        k += 1
+    if k == n:
+        return None, -1
+    if k == j or (sign < 0 and k == j + 1):
+        # true/false/null: skip to the end of the literal
+        while k < n and data[k] not in (44, 125, 93, 32, 9, 10, 13):
+            k += 1
+        return None, (k if k < n else -1)
+    return sign * value, k
+
+
+def scan_fields(stream, keys):
+    """Pull the first value of each key out of a streamed JSON body
+    
+    Reads into the shared 1 KB buffer and carries over only a short tail, so
+    neither the document nor its dict tree (activity included) is ever built.
+    Returns the values in keys order, None for keys that were not found.
+    """
+    buf = _buf
+    mv = memoryview(buf)
+    size = len(buf)
+    values = [None] * len(keys)
+    pending = list(range(len(keys)))
+    tail = max(len(key) for key in keys) + 2
+    n = 0
+    while pending:
+        got = stream.readinto(mv[n:])
+        n += got
+        keep = max(0, n - tail)
+        
+        for idx in pending[:]:
+            key = keys[idx]
+            start = 0
+            while True:
+                i = buf.find(key, start, n)
+                if i < 0:
+                    break
+                
+                j = i + len(key)
+                while j < n and buf[j] in (32, 9, 10, 13):
+                    j += 1
+                if j < n and buf[j] != 58:
+                    # A string value that happens to match the key
+                    start = j
+                    continue
+                
+                value, end = parse_scalar(buf, j + 1, n) if j < n else (None, -1)
+                if end < 0:
+                    # Value may continue in the next read
+                    keep = min(keep, i)
+                else:
+                    values[idx] = value
+                    pending.remove(idx)
+                break
+        
+        if not got:
+            break
+        if keep == 0 and n == size:
+            # A value longer than the buffer; drop it rather than stall
+            keep = n - tail
+        buf[:n - keep] = buf[keep:n]
+        n -= keep
+    
+    return values
+
+
+def store_profile(username, name, repos, followers, stars, forks):
+    """Replace the cached profile and stamp it with the current time"""
+    global _username, _name, _repos, _followers, _stars, _forks, _ts
+    _username = username
+    _name = name
+    _repos = repos
+    _followers = followers
+    _stars = stars
+    _forks = forks
+    _ts = time.time()
+
+
+def conditional_headers(url):
+    """If-None-Match/If-Modified-Since for url when the cached profile came from it"""
+    if _username is None or _validator_url != url:
+        return None
+    headers = {}
+    if _etag:
+        headers["If-None-Match"] = _etag
+    if _last_modified:
+        headers["If-Modified-Since"] = _last_modified
+    return headers
+
+
+def store_validators(url, response):
+    """Remember the validators of the response the cached profile was built from"""
+    global _etag, _last_modified, _validator_url
+    _etag = response.headers.get("etag")
+    _last_modified = response.headers.get("last-modified")
+    _validator_url = url
+
+
+def update_refresh_interval(response):
+    """Follow the server's Cache-Control max-age for the auto refresh period"""
+    global _refresh_ms
+    cache_control = response.headers.get("cache-control", "")
+    i = cache_control.find("max-age=")
+    if i >= 0:
+        try:
+            _refresh_ms = max(int(cache_control[i + 8:].split(",")[0]) * 1000, MIN_REFRESH_MS)
+        except ValueError:
+            pass
+
+
+def data_unchanged(response):
+    """Handle a 304: keep the cached profile and restamp it; returns True if it was one"""
+    global _ts
+    if response.status_code != 304:
+        return False
+    _ts = time.time()
+    update_refresh_interval(response)
+    response.close()
+    print("✅ Data unchanged")
+    return True
+
 
 def fetch_data():
     """Fetch and cache data from local server"""
-    global cache
     
     try:
         print("🔄 Fetching data from local server...")
-        response = urequests.get(DATA_URL, timeout=10)
+        gc.collect()
+        response = session.get(DATA_URL, headers=conditional_headers(DATA_URL), timeout=10, stream=True)
         print(f"📡 Response status: {response.status_code}")
         
+        if data_unchanged(response):
+            return True
         if response.status_code == 200:
-            cache["data"] = response.json()
-            cache["timestamp"] = time.time()
-            print("✅ Data cached successfully")
+            username, name, repos, followers, stars, forks = scan_fields(response.stream, DATA_KEYS)
             response.close()
-            return True
+            if username is None:
+                print("❌ No profile in response")
+            else:
+                store_profile(username, name or username, repos or 0, followers or 0, stars or 0, forks or 0)
+                store_validators(DATA_URL, response)
+                update_refresh_interval(response)
+                print("✅ Data cached successfully")
+                return True
         else:
             print(f"❌ HTTP error: {response.status_code}")
         response.close()
@@ -70,29 +304,26 @@ def fetch_data():
     # Fallback to simple text
     try:
         print("🔄 Trying fallback URL...")
-        response = urequests.get(FALLBACK_URL, timeout=10)
+        gc.collect()
+        response = session.get(FALLBACK_URL, headers=conditional_headers(FALLBACK_URL), timeout=10, stream=True)
         print(f"📡 Fallback response status: {response.status_code}")
         
+        if data_unchanged(response):
+            return True
         if response.status_code == 200:
-            lines = response.text.strip().split('\n')
+            # Read only the lines we need, one at a time
+            lines = []
+            while len(lines) < FALLBACK_LINES:
+                line = response.stream.readline()
+                if not line:
+                    break
+                lines.append(line.decode().strip())
             print(f"📝 Received {len(lines)} lines")
             
-            if len(lines) >= 6:
-                cache["data"] = {
-                    'profile': {
-                        'username': lines[0],
-                        'name': lines[1], 
-                        'public_repos': int(lines[2]),
-                        'followers': int(lines[3]),
-                        'html_url': f'https://github.com/{lines[0]}'
-                    },
-                    'stats': {
-                        'total_stars': int(lines[4]),
-                        'total_forks': int(lines[5])
-                    },
-                    'activity': []
-                }
-                cache["timestamp"] = time.time()
+            if len(lines) == FALLBACK_LINES:
+                store_profile(lines[0], lines[1], int(lines[2]), int(lines[3]), int(lines[5]), int(lines[6]))
+                store_validators(FALLBACK_URL, response)
+                update_refresh_interval(response)
                 print("✅ Fallback data cached successfully")
                 response.close()
                 return True
@@ -103,36 +334,60 @@ def fetch_data():
     print("❌ All data fetch attempts failed")
     return False
 
+@micropython.native
 def draw_header(title):
     """Draw header"""
     display.set_pen(0)
-    display.rectangle(0, 0, WIDTH, 20)
+    display.rectangle(0, 0, WIDTH, _HEADER_H)
     display.set_pen(15)
     display.set_font("bitmap8")
     display.text("GitHub", 4, 6, WIDTH, 1)
     
     # Page indicator
-    indicator = f"{current_page + 1}/{len(PAGES)}"
-    display.text(indicator, WIDTH - 30, 6, WIDTH, 1)
+    display.text(PAGE_INDICATORS[current_page], _INDICATOR_X, 6, WIDTH, 1)
     
-    # Title
+    # Title (measured once per title)
     display.set_font("bitmap6")
-    title_width = display.measure_text(title, 1)
-    display.text(title, (WIDTH - title_width) // 2, 6, WIDTH, 1)
+    title_x = title_positions.get(title)
+    if title_x is None:
+        title_x = title_positions[title] = (WIDTH - display.measure_text(title, 1)) // 2
+    display.text(title, title_x, 6, WIDTH, 1)
+
+def footer_age():
+    """Data age in minutes as the footer shows it (whole hours past 60), -1 with no data"""
+    if _ts <= 0:
+        return -1
+    age = int((time.time() - _ts) // 60)
+    return age if age < 60 else age - age % 60
 
+
+def ms_until_footer_change():
+    """Milliseconds until footer_age() next changes, or None with no data"""
+    if _ts <= 0:
+        return None
+    age = time.time() - _ts
+    step = 60 if age < 3600 else 3600
+    return int((step - age % step) * 1000)
+
+
+@micropython.native
 def draw_footer():
-    """Draw status footer"""
+    """Draw status footer, reformatting the text only when the age in minutes changes"""
+    global _last_status, _last_status_min
     display.set_pen(0)
     display.set_font("bitmap6")
     
-    if cache["timestamp"] > 0:
-        age = int((time.time() - cache["timestamp"]) / 60)
-        status = f"Local: {age}m ago" if age < 60 else f"Local: {age//60}h ago"
-    else:
-        status = "No data"
+    age = footer_age()
+    if age != _last_status_min:
+        if age < 0:
+            _last_status = "No data"
+        else:
+            _last_status = f"Local: {age}m ago" if age < 60 else f"Local: {age//60}h ago"
+        _last_status_min = age
     
-    display.text(status, 4, HEIGHT - 12, WIDTH, 1)
+    display.text(_last_status, 4, _FOOTER_Y, WIDTH, 1)
 
+@micropython.native
 def draw_overview_page():
     """Draw overview page"""
     display.set_pen(15)
@@ -140,41 +395,28 @@ def draw_overview_page():
     
     draw_header("Overview")
     
-    if not cache["data"]:
+    if _username is None:
         display.set_font("bitmap8")
         display.text("No data available", 20, 50, WIDTH, 1)
         display.text("Check network connection", 20, 70, WIDTH, 1)
         draw_footer()
         return
     
-    profile = cache["data"].get("profile", {})
-    stats = cache["data"].get("stats", {})
-    
-    y = 30
     display.set_font("bitmap8")
     
     # Name and username
-    name = profile.get("name", "Unknown")
-    username = profile.get("username", "unknown")
-    display.text(f"{name}", 10, y, WIDTH, 1)
-    y += 15
-    display.text(f"@{username}", 10, y, WIDTH, 1)
-    y += 20
+    display.text(_name, _TEXT_X, _ROW_NAME, WIDTH, 1)
+    display.text(f"@{_username}", _TEXT_X, _ROW_USERNAME, WIDTH, 1)
     
     # Stats
     display.set_font("bitmap6")
-    repos = profile.get("public_repos", 0)
-    followers = profile.get("followers", 0)
-    stars = stats.get("total_stars", 0)
-    
-    display.text(f"Repos: {repos}", 10, y, WIDTH, 1)
-    y += 12
-    display.text(f"Followers: {followers}", 10, y, WIDTH, 1)
-    y += 12
-    display.text(f"Stars: {stars}", 10, y, WIDTH, 1)
+    display.text(f"Repos: {_repos}", _TEXT_X, _ROW_REPOS, WIDTH, 1)
+    display.text(f"Followers: {_followers}", _TEXT_X, _ROW_FOLLOWERS, WIDTH, 1)
+    display.text(f"Stars: {_stars}", _TEXT_X, _ROW_STARS, WIDTH, 1)
     
     draw_footer()
 
+@micropython.native
 def draw_test_page():
     """Draw test results page"""
     display.set_pen(15)
@@ -182,90 +424,136 @@ def draw_test_page():
     
     draw_header("Test Results")
     
-    y = 30
     display.set_font("bitmap6")
     
-    display.text("Local Server Test:", 10, y, WIDTH, 1)
-    y += 15
+    display.text("Local Server Test:", _TEXT_X, _ROW_TEST_TITLE, WIDTH, 1)
     
-    if cache["data"]:
-        display.text("✓ Data loaded successfully", 10, y, WIDTH, 1)
-        y += 12
-        
-        profile = cache["data"].get("profile", {})
-        username = profile.get("username", "unknown")
-        display.text(f"✓ User: {username}", 10, y, WIDTH, 1)
-        y += 12
-        
-        repos = profile.get("public_repos", 0)
-        display.text(f"✓ Repos: {repos}", 10, y, WIDTH, 1)
+    if _username is not None:
+        display.text("✓ Data loaded successfully", _TEXT_X, _ROW_TEST_1, WIDTH, 1)
+        display.text(f"✓ User: {_username}", _TEXT_X, _ROW_TEST_2, WIDTH, 1)
+        display.text(f"✓ Repos: {_repos}", _TEXT_X, _ROW_TEST_3, WIDTH, 1)
     else:
-        display.text("✗ No data loaded", 10, y, WIDTH, 1)
-        y += 12
-        display.text("Check server & network", 10, y, WIDTH, 1)
+        display.text("✗ No data loaded", _TEXT_X, _ROW_TEST_1, WIDTH, 1)
+        display.text("Check server & network", _TEXT_X, _ROW_TEST_2, WIDTH, 1)
     
     draw_footer()
 
+def get_qr_code():
+    """The shared QRCode, importing qrcode on first call; None if it is not installed"""
+    global _qr_mod, _qr_code
+    if _qr_mod is None:
+        try:
+            import qrcode
+            _qr_mod = qrcode
+            _qr_code = qrcode.QRCode()
+        except ImportError:
+            _qr_mod = False
+    return _qr_code
+
+
+def _on_btn(bit):
+    """IRQ handler: latch a button press"""
+    global _evt
+    _evt |= bit
+
+
+def setup_button_irqs():
+    """Attach rising-edge IRQs (the buttons are active high) that also wake lightsleep"""
+    for i, pin in enumerate(BUTTON_PINS):
+        pin.irq(trigger=machine.Pin.IRQ_RISING, handler=lambda p, b=1 << i: _on_btn(b))
+
+
+def take_button_events():
+    """Return and clear the latched presses"""
+    global _evt
+    state = machine.disable_irq()
+    evt = _evt
+    _evt = 0
+    machine.enable_irq(state)
+    return evt
+
+
 def main():
     """Main application loop"""
-    global current_page
+    global current_page, _dirty
     
     print("🦡 Starting GitHub Badge Test Application")
     print("=========================================")
     
+    # Collect once a quarter of the free heap has been allocated, not every frame
+    gc.collect()
+    gc.threshold(gc.mem_free() // 4)
+    
     # Initial data fetch
     print("📡 Initial data fetch...")
-    fetch_data()
+    if fetch_data():
+        gc.collect()
     
     # Display test results first
     draw_test_page()
     display.update()
+    display.set_update_speed(badger2040.UPDATE_TURBO)
     
-    last_update = time.time()
-    button_states = [False, False, False, False, False]
+    next_refresh = time.ticks_add(time.ticks_ms(), _refresh_ms)
+    setup_button_irqs()
     
     while True:
-        # Check buttons
-        buttons = [
-            display.pressed(badger2040.BUTTON_A),
-            display.pressed(badger2040.BUTTON_B), 
-            display.pressed(badger2040.BUTTON_C),
-            display.pressed(badger2040.BUTTON_UP),
-            display.pressed(badger2040.BUTTON_DOWN)
-        ]
+        evt = take_button_events()
         
         # Button A - Previous page
-        if buttons[0] and not button_states[0]:
-            current_page = (current_page - 1) % len(PAGES)
-            print(f"📄 Page: {PAGES[current_page]}")
+        if evt & EVT_A:
+            current_page = (current_page - 1) % len(_PAGES)
+            _dirty = True
+            print(f"📄 Page: {_PAGES[current_page]}")
             
         # Button B - Next page  
-        elif buttons[1] and not button_states[1]:
-            current_page = (current_page + 1) % len(PAGES)
-            print(f"📄 Page: {PAGES[current_page]}")
+        elif evt & EVT_B:
+            current_page = (current_page + 1) % len(_PAGES)
+            _dirty = True
+            print(f"📄 Page: {_PAGES[current_page]}")
             
         # Button C - Refresh data
-        elif buttons[2] and not button_states[2]:
+        elif evt & EVT_C:
             print("🔄 Manual refresh...")
-            fetch_data()
-            
-        button_states = buttons
+            if fetch_data():
+                # The response's garbage can go now; the redraw hides the pause
+                gc.collect()
+                _dirty = True
         
-        # Auto refresh every 5 minutes
-        if time.time() - last_update > 300:
+        # Auto refresh (every 5 minutes unless the server's max-age says otherwise)
+        if time.ticks_diff(time.ticks_ms(), next_refresh) >= 0:
             print("🔄 Auto refresh...")
-            fetch_data()
-            last_update = time.time()
+            if fetch_data():
+                # The response's garbage can go now; the redraw hides the pause
+                gc.collect()
+                _dirty = True
+            next_refresh = time.ticks_add(time.ticks_ms(), _refresh_ms)
         
-        # Draw current page
-        if current_page == 0 or PAGES[current_page] == "overview":
-            draw_overview_page()
-        else:
-            draw_test_page()
+        # The footer's "Xm ago" rolled over
+        if footer_age() != _last_status_min:
+            _dirty = True
+        
+        # Draw current page, only when something changed
+        if _dirty:
+            if current_page == 0 or _PAGES[current_page] == "overview":
+                draw_overview_page()
+            else:
+                draw_test_page()
+            display.update()
+            _dirty = False
             
-        display.update()
-        time.sleep(0.1)
-        gc.collect()
+            # Debounce: drop edges from the same press
+            time.sleep_ms(_DEBOUNCE_MS)
+            take_button_events()
+        
+        # Sleep until a button IRQ fires, the refresh is due or the footer changes
+        if not _evt:
+            wait_ms = time.ticks_diff(next_refresh, time.ticks_ms())
+            footer_ms = ms_until_footer_change()
+            if footer_ms is not None and footer_ms < wait_ms:
+                wait_ms = footer_ms
+            if wait_ms > 0:
+                machine.lightsleep(wait_ms)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,19 @@
+# MicroPython frozen manifest for the Badger 2040 W badge
+# Freezes the app and its config into the firmware so their bytecode and
+# constants live in flash instead of on the GC heap.
+#
+# Build with: make firmware-frozen  (needs ../micropython and ../pimoroni-pico;
+# $(BOARD_DIR) below is pimoroni-pico's PIMORONI_BADGER2040W board)
+# On the device, main.py then only needs:
+#     import github_actions_main
+#     github_actions_main.main()
+# or, for the local-server test build:
+#     import main_test_local
+#     main_test_local.main()
+
+include("$(BOARD_DIR)/manifest.py")
+
+freeze(".", ("github_actions_main.py", "badge_http.py", "badge_config.py"))
+
+# Local-server test app; opt=3 drops docstrings, asserts and line numbers
+freeze(".", "main_test_local.py", opt=3)
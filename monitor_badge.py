@@ -3,18 +3,8 @@
 Monitor the Badger 2040 W device output to see badge operation
 """
 
-import serial
 import time
-import glob
-
-def find_device():
-    """Find connected Pico device"""
-    patterns = ['/dev/tty.usbmodem*', '/dev/ttyACM*']
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+from badge_serial import find_device, open_repl
 
 def monitor_badge():
     """Monitor badge application output"""
@@ -28,22 +18,27 @@ def monitor_badge():
     print("=" * 50)
     
     try:
-        ser = serial.Serial(device, 115200, timeout=1)
+        ser = open_repl(device)
+        
+        # Bytes received but not yet ended by a newline
+        pending = bytearray()
         
         while True:
-            if ser.in_waiting > 0:
-                data = ser.read(ser.in_waiting)
-                try:
-                    text = data.decode('utf-8', errors='ignore')
-                    if text.strip():
-                        # Add timestamp
-                        timestamp = time.strftime("%H:%M:%S")
-                        for line in text.strip().split('\n'):
-                            if line.strip():
-                                print(f"[{timestamp}] {line}")
-                except:
-                    pass
-            time.sleep(0.1)
+            # Block (up to the 1 s timeout) for at least one byte, then take whatever else arrived
+            data = ser.read(max(1, ser.in_waiting))
+            if not data:
+                continue
+            pending.extend(data)
+            
+            timestamp = time.strftime("%H:%M:%S")
+            while True:
+                i = pending.find(b'\n')
+                if i < 0:
+                    break
+                line = pending[:i].decode('utf-8', errors='ignore').rstrip()
+                del pending[:i + 1]
+                if line.strip():
+                    print(f"[{timestamp}] {line}")
             
     except KeyboardInterrupt:
         print("\n🛑 Monitoring stopped")
@@ -4,17 +4,7 @@ Simple diagnostic script to check current device status
 """
 
 import time
-import serial
-import glob
-
-def find_device():
-    """Find the Pico device"""
-    patterns = ['/dev/tty.usbmodem*', '/dev/ttyACM*']
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+from badge_serial import find_device, open_repl, send_ctrl_c
 
 def monitor_device():
     """Monitor device output for debugging"""
@@ -27,11 +17,10 @@ def monitor_device():
     print("Press Ctrl+C to stop monitoring")
     
     try:
-        ser = serial.Serial(device, 115200, timeout=1)
+        ser = open_repl(device)
         
         # Send interrupt to see current status
-        ser.write(b'\x03\r\n')
-        time.sleep(0.5)
+        print(send_ctrl_c(ser, timeout=0.5).decode('utf-8', errors='ignore'), end='')
         
         # Send a simple status check
         ser.write(b'print("Device Status Check")\r\n')
@@ -7,37 +7,47 @@ import serial
 import time
 import sys
 import os
-import glob
-from typing import Optional, List
+import mmap
+from typing import List
+from badge_serial import wait_for_device, open_repl, send_ctrl_c, read_until, exec_raw, open_raw_repl
 
-def find_pico_device() -> Optional[str]:
-    """Find connected Pico device"""
-    patterns = [
-        '/dev/tty.usbmodem*',
-        '/dev/ttyACM*',
-        '/dev/ttyUSB*'
-    ]
-    
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+# Runs on the device: receives size raw bytes on stdin and writes them to name.
+# Ctrl+C handling is off while receiving so 0x03 bytes in the file are data.
+UPLOAD_PROGRAM = """import sys, micropython
+f = open({name!r}, 'wb')
+micropython.kbd_intr(-1)
+try:
+    print('READY')
+    n = {size}
+    buf = memoryview(bytearray(256))
+    r = sys.stdin.buffer.readinto
+    while n:
+        k = r(buf[:min(n, 256)])
+        f.write(buf[:k])
+        n -= k
+finally:
+    micropython.kbd_intr(3)
+    f.close()
+print('File uploaded successfully')
+"""
 
-def wait_for_device(timeout: int = 10) -> Optional[str]:
-    """Wait for device to become available"""
-    print(f"⏳ Waiting for device (timeout: {timeout}s)...")
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        device = find_pico_device()
-        if device:
-            print(f"✅ Found device: {device}")
-            return device
-        time.sleep(1)
-    
-    print("❌ Device not found")
-    return None
+UPLOAD_CHUNK = 256
+
+def wait_until_ready(device_path: str, timeout: float = 2.0) -> bool:
+    """Poll every 50 ms until the REPL answers a newline with a prompt or banner"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        try:
+            with open_repl(device_path, timeout=0.05) as ser:
+                ser.write(b'\r\n')
+                reply = ser.read(64)
+        except (serial.SerialException, OSError):
+            # Port not back yet
+            continue
+        if b'>>>' in reply or b'MicroPython' in reply:
+            return True
+    return False
 
 def reset_device_connection(device_path: str) -> bool:
     """Reset device connection by toggling DTR/RTS"""
@@ -63,36 +73,25 @@ def reset_device_connection(device_path: str) -> bool:
         ser.rts = False
         
         ser.close()
-        time.sleep(2)  # Wait for device to restart
         
-        print("✅ Connection reset complete")
+        # Return as soon as the REPL answers instead of a fixed wait
+        if wait_until_ready(device_path):
+            print("✅ Connection reset complete")
+        else:
+            print("⚠️  Connection reset, but no REPL prompt yet")
         return True
         
     except Exception as e:
         print(f"❌ Reset failed: {e}")
         return False
 
-def send_ctrl_c(device_path: str) -> bool:
+def interrupt_program(device_path: str) -> bool:
     """Send Ctrl+C to interrupt any running program"""
     try:
         print("🛑 Sending Ctrl+C to interrupt any running program...")
         
-        ser = serial.Serial(device_path, 115200, timeout=2)
-        
-        # Send Ctrl+C multiple times
-        for _ in range(3):
-            ser.write(b'\x03')  # Ctrl+C
-            time.sleep(0.1)
-        
-        # Wait for response
-        time.sleep(1)
-        
-        # Clear any pending data
-        ser.reset_input_buffer()
-        ser.reset_output_buffer()
-        
-        ser.close()
-        time.sleep(1)
+        with open_repl(device_path, timeout=0.05) as ser:
+            send_ctrl_c(ser)
         
         print("✅ Interrupt sent")
         return True
@@ -101,8 +100,8 @@ def send_ctrl_c(device_path: str) -> bool:
         print(f"❌ Failed to send interrupt: {e}")
         return False
 
-def upload_file_raw(device_path: str, local_file: str, remote_name: str = None) -> bool:
-    """Upload file using raw serial communication"""
+def upload_one(ser: serial.Serial, local_file: str, remote_name: str = None) -> bool:
+    """Upload one file over a raw REPL session; the session is back at the prompt afterwards"""
     if remote_name is None:
         remote_name = os.path.basename(local_file)
     
@@ -113,58 +112,56 @@ def upload_file_raw(device_path: str, local_file: str, remote_name: str = None)
     try:
         print(f"📤 Uploading {local_file} -> {remote_name}")
         
-        # Read file content
-        with open(local_file, 'rb') as f:
-            content = f.read()
-        
-        ser = serial.Serial(device_path, 115200, timeout=5, write_timeout=5)
-        
-        # Send Ctrl+C to get to REPL
-        ser.write(b'\x03')
-        time.sleep(0.5)
-        
-        # Enter raw REPL mode
-        ser.write(b'\x01')  # Ctrl+A for raw REPL
-        time.sleep(0.5)
+        size = os.path.getsize(local_file)
         
-        # Wait for raw REPL prompt
-        response = ser.read(100)
-        if b'raw REPL' not in response:
-            print(f"❌ Failed to enter raw REPL: {response}")
-            ser.close()
+        # Start the receiver, then stream the file bytes unescaped
+        exec_raw(ser, UPLOAD_PROGRAM.format(name=remote_name, size=size))
+        response = read_until(ser, b'READY\r\n', timeout=5)
+        if not response.endswith(b'READY\r\n'):
+            # Let the failed program finish so the next upload starts at the prompt
+            response += read_until(ser, b'\x04>')
+            print(f"❌ Upload failed: {response.decode('utf-8', errors='ignore')}")
             return False
         
-        # Create file upload command
-        upload_cmd = f"""
-with open('{remote_name}', 'wb') as f:
-    f.write({repr(content)})
-print('File uploaded successfully')
-""".strip()
-        
-        # Send command
-        ser.write(upload_cmd.encode() + b'\x04')  # Ctrl+D to execute
+        # Map the file rather than reading it in; mmap rejects empty files
+        if size:
+            with open(local_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for i in range(0, size, UPLOAD_CHUNK):
+                    ser.write(mm[i:i + UPLOAD_CHUNK])
         
-        # Wait for execution
-        time.sleep(2)
+        # stdout and stderr each end with Ctrl+D, then the raw REPL prompt returns
+        response += read_until(ser, b'\x04')
+        errors = read_until(ser, b'\x04>')
+        response = response.decode('utf-8', errors='ignore')
         
-        # Read response
-        response = ser.read(1000).decode('utf-8', errors='ignore')
-        
-        ser.close()
-        
-        if 'File uploaded successfully' in response:
+        if 'File uploaded successfully' in response and errors == b'\x04>':
             print(f"✅ Successfully uploaded {remote_name}")
             return True
         else:
-            print(f"❌ Upload failed: {response}")
+            print(f"❌ Upload failed: {response}{errors.decode('utf-8', errors='ignore')}")
             return False
             
     except Exception as e:
         print(f"❌ Upload error: {e}")
         return False
 
+def upload_file_raw(device_path: str, local_file: str, remote_name: str = None) -> bool:
+    """Upload a single file in its own raw REPL session"""
+    try:
+        ser = open_raw_repl(device_path)
+    except Exception as e:
+        print(f"❌ Upload error: {e}")
+        return False
+    if not ser:
+        return False
+    try:
+        return upload_one(ser, local_file, remote_name)
+    finally:
+        ser.close()
+
 def upload_files(files: List[str]) -> bool:
-    """Upload multiple files with retry logic"""
+    """Upload multiple files back to back in one raw REPL session"""
     device = wait_for_device()
     if not device:
         return False
@@ -178,16 +175,27 @@ def upload_files(files: List[str]) -> bool:
         return False
     
     # Send interrupt to clear any running programs
-    if not send_ctrl_c(device):
+    if not interrupt_program(device):
         print("⚠️  Warning: Could not send interrupt")
     
+    try:
+        ser = open_raw_repl(device)
+    except Exception as e:
+        print(f"❌ Could not open {device}: {e}")
+        return False
+    if not ser:
+        return False
+    
     # Upload each file
     success_count = 0
-    for file_path in files:
-        if upload_file_raw(device, file_path):
-            success_count += 1
-        else:
-            print(f"❌ Failed to upload {file_path}")
+    try:
+        for file_path in files:
+            if upload_one(ser, file_path):
+                success_count += 1
+            else:
+                print(f"❌ Failed to upload {file_path}")
+    finally:
+        ser.close()
     
     print(f"\n📊 Upload Summary: {success_count}/{len(files)} files uploaded successfully")
     return success_count == len(files)
@@ -196,6 +204,8 @@ def main():
     """Main function"""
     files_to_upload = [
         'main.py',
+        'badge_http.py',
+        'badge_ui.py',
         'badge_config.py',
         'install_qrcode.py'
     ]
@@ -3,20 +3,7 @@
 Simple script to run the main application on Badger 2040 W
 """
 
-import serial
-import time
-import glob
-from typing import Optional
-
-def find_device() -> Optional[str]:
-    """Find the Pico device"""
-    patterns = ['/dev/tty.usbmodem*', '/dev/ttyACM*', '/dev/ttyUSB*']
-    
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+from badge_serial import find_device, open_repl, send_ctrl_c
 
 def run_main():
     """Run the main application"""
@@ -28,17 +15,15 @@ def run_main():
     try:
         print(f"🚀 Running main application on {device}...")
         
-        ser = serial.Serial(device, 115200, timeout=3)
+        ser = open_repl(device, timeout=3)
         
         # Send Ctrl+C to interrupt
-        ser.write(b'\x03')
-        time.sleep(0.5)
+        send_ctrl_c(ser, timeout=0.5)
         
         # Send import command
         ser.write(b'import main\r\n')
-        time.sleep(1)
         
-        # Read response
+        # Read response (blocks up to the port timeout)
         response = ser.read(200).decode('utf-8', errors='ignore')
         print(f"Response: {response}")
         
@@ -5,11 +5,37 @@ Fetches GitHub profile data and generates JSON files for Badger 2040 W consumpti
 """
 
 import os
+import gzip
 import json
+import struct
 import requests
+import urllib3
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# What a failed fetch can raise: requests' errors, urllib3's while a body streams, ijson's on a bad body
+FETCH_ERRORS = (requests.exceptions.RequestException, urllib3.exceptions.HTTPError)
+if ijson:
+    FETCH_ERRORS += (ijson.JSONError,)
 
 # Configuration
 USERNAME = os.environ.get('USERNAME', 'Julian-Elliott')
@@ -17,6 +43,10 @@ GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 OUTPUT_DIR = 'data'
 PUBLIC_DIR = 'public'
 
+# ETags and bodies of earlier responses, keyed by URL, for conditional requests
+HTTP_CACHE_FILE = f'{OUTPUT_DIR}/.http_cache.json'
+http_cache: Dict[str, Dict[str, Any]] = {}
+
 # GitHub API configuration
 HEADERS = {
     'User-Agent': 'GitHub-Badge-Generator',
@@ -26,34 +56,127 @@ HEADERS = {
 if GITHUB_TOKEN:
     HEADERS['Authorization'] = f'token {GITHUB_TOKEN}'
 
+# One session for every request, so connections (and their TLS handshakes) are pooled and reused
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+
 # API URLs
 USER_URL = f'https://api.github.com/users/{USERNAME}'
 REPOS_URL = f'https://api.github.com/users/{USERNAME}/repos?per_page=100&sort=updated'
 EVENTS_URL = f'https://api.github.com/users/{USERNAME}/events?per_page=30'
 CONTRIB_URL = f'https://github-contributions-api.jogruber.de/v4/{USERNAME}'
 
+# Activity event types -> (action, icon); others fall back to the type name and '•'
+EVENT_ACTIONS = {
+    'PushEvent': ('Pushed to', '→'),
+    'CreateEvent': ('Created', '+'),
+    'WatchEvent': ('Starred', '⭐'),
+    'ForkEvent': ('Forked', '⑂'),
+    'IssuesEvent': ('Issue on', '!'),
+    'PullRequestEvent': ('PR on', '↗'),
+}
+
 def ensure_directories():
     """Ensure output directories exist"""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(PUBLIC_DIR, exist_ok=True)
     os.makedirs(f'{PUBLIC_DIR}/api', exist_ok=True)
 
-def fetch_github_data(url: str, description: str) -> Dict[str, Any]:
-    """Fetch data from GitHub API with error handling"""
+def load_http_cache():
+    """Load the response cache written by the previous run, if any"""
+    try:
+        with open(HTTP_CACHE_FILE, 'rb') as f:
+            http_cache.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+
+def save_http_cache():
+    """Persist the response cache for the next run"""
+    with open(HTTP_CACHE_FILE, 'wb') as f:
+        f.write(encode_json(http_cache))
+
+def fetch_github_data(url: str, description: str,
+                      reduce: Optional[Callable[[Any], Any]] = None) -> Dict[str, Any]:
+    """Fetch data from GitHub API with error handling
+    
+    Revalidates with If-None-Match when an earlier response had an ETag and
+    reuses its body on 304 Not Modified. With reduce, the body is streamed
+    and reduce(response) replaces the parsed JSON. Reduced results bypass the
+    cache: they can depend on the day (the contribution streaks do), so a
+    replayed one would go stale.
+    """
     try:
         print(f"Fetching {description}...")
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        
-        # Check rate limit
-        remaining = response.headers.get('X-RateLimit-Remaining', 'unknown')
-        print(f"  ✓ Success ({remaining} requests remaining)")
-        
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        cached = http_cache.get(url) if reduce is None else None
+        headers = {'If-None-Match': cached['etag']} if cached else None
+        # Closed on every path, so a streamed body never holds its connection
+        with SESSION.get(url, headers=headers, timeout=30, stream=reduce is not None) as response:
+            # Check rate limit
+            remaining = response.headers.get('X-RateLimit-Remaining', 'unknown')
+            if response.status_code == 304:
+                print(f"  ✓ {description} unchanged ({remaining} requests remaining)")
+                return cached['body']
+            response.raise_for_status()
+            print(f"  ✓ Fetched {description} ({remaining} requests remaining)")
+            
+            data = reduce(response) if reduce else response.json()
+            etag = response.headers.get('ETag')
+        if etag and reduce is None:
+            http_cache[url] = {'etag': etag, 'body': data}
+        else:
+            http_cache.pop(url, None)
+        return data
+    except FETCH_ERRORS as e:
         print(f"  ✗ Failed to fetch {description}: {e}")
         return {}
 
+def encode_json(data: Any, pretty: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON, indented by two spaces if pretty, else minified"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def write_if_changed(path: str, payload: bytes) -> bool:
+    """Write payload to path unless the file already holds exactly these bytes
+    
+    Leaving unchanged files alone keeps their mtimes, so git and the Pages
+    deploy see no change. Returns True if the file was written.
+    """
+    try:
+        if os.path.getsize(path) == len(payload):
+            with open(path, 'rb') as f:
+                if f.read() == payload:
+                    return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return True
+
+def save_public(filename: str, payload: bytes) -> None:
+    """Write payload to the public API, with a maximally gzipped copy beside it
+    
+    local_server.py answers gzip-accepting clients with the .gz copy; mtime=0
+    keeps its bytes identical when the payload hasn't changed.
+    """
+    path = f'{PUBLIC_DIR}/api/{filename}'
+    # An unchanged payload has an unchanged .gz, so skip recompressing it
+    if write_if_changed(path, payload) or not os.path.exists(f'{path}.gz'):
+        write_if_changed(f'{path}.gz', gzip.compress(payload, compresslevel=9, mtime=0))
+
+def save_json(filename: str, data: Any) -> None:
+    """Write data pretty-printed to the data directory and minified to the public API"""
+    pretty = encode_json(data, pretty=True)
+    compact = encode_json(data)
+    
+    # Data directory (for repository)
+    write_if_changed(f'{OUTPUT_DIR}/{filename}', pretty)
+    
+    # Public directory (for GitHub Pages)
+    save_public(filename, compact)
+
 def analyze_repositories(repos: List[Dict]) -> Dict[str, Any]:
     """Analyze repository data for statistics"""
     if not repos:
@@ -68,36 +191,34 @@ def analyze_repositories(repos: List[Dict]) -> Dict[str, Any]:
             'avg_stars': 0
         }
     
-    total_stars = sum(repo.get('stargazers_count', 0) for repo in repos)
-    total_forks = sum(repo.get('forks_count', 0) for repo in repos)
-    
-    # Language analysis
-    languages = {}
-    topics = {}
+    # Totals, language/topic counts and the most starred repo in one pass
+    total_stars = 0
+    total_forks = 0
+    languages = Counter()
+    topics = Counter()
+    most_starred = None
+    most_stars = -1
     
     for repo in repos:
-        # Count languages
+        stars = repo.get('stargazers_count', 0)
+        total_stars += stars
+        total_forks += repo.get('forks_count', 0)
+        if stars > most_stars:
+            most_starred, most_stars = repo, stars
+        
         lang = repo.get('language')
         if lang:
-            languages[lang] = languages.get(lang, 0) + 1
-            
-        # Count topics
-        for topic in repo.get('topics', []):
-            topics[topic] = topics.get(topic, 0) + 1
-    
-    # Sort by frequency
-    languages = dict(sorted(languages.items(), key=lambda x: x[1], reverse=True))
-    topics = dict(sorted(topics.items(), key=lambda x: x[1], reverse=True))
-    
-    # Find most starred repo
-    most_starred = max(repos, key=lambda x: x.get('stargazers_count', 0))
+            languages[lang] += 1
+        topics.update(repo.get('topics', []))
     
     return {
         'total_repos': len(repos),
         'total_stars': total_stars,
         'total_forks': total_forks,
-        'languages': languages,
-        'topics': topics,
+        # Most frequent first; the compact badge takes the top five
+        'languages': dict(languages.most_common()),
+        # Only published in the full stats, where nothing relies on the order
+        'topics': dict(topics),
         'most_starred': {
             'name': most_starred.get('name'),
             'stars': most_starred.get('stargazers_count', 0),
@@ -121,85 +242,112 @@ def process_activity_events(events: List[Dict]) -> List[Dict]:
         created_at = event.get('created_at', '')
         
         # Simplify event descriptions
-        if event_type == 'PushEvent':
-            action = 'Pushed to'
-            icon = '→'
-        elif event_type == 'CreateEvent':
-            action = 'Created'
-            icon = '+'
-        elif event_type == 'WatchEvent':
-            action = 'Starred'
-            icon = '⭐'
-        elif event_type == 'ForkEvent':
-            action = 'Forked'
-            icon = '⑂'
-        elif event_type == 'IssuesEvent':
-            action = 'Issue on'
-            icon = '!'
-        elif event_type == 'PullRequestEvent':
-            action = 'PR on'
-            icon = '↗'
-        else:
-            action = event_type.replace('Event', '')
-            icon = '•'
+        action, icon = EVENT_ACTIONS.get(event_type) or (event_type.replace('Event', ''), '•')
+        repo_short = repo_name.rsplit('/', 1)[-1]
         
         processed_events.append({
             'type': event_type,
             'action': action,
             'icon': icon,
             'repo': repo_name,
-            'repo_short': repo_name.split('/')[-1] if '/' in repo_name else repo_name,
+            'repo_short': repo_short,
             'created_at': created_at,
-            'display': f"{icon} {action} {repo_name.split('/')[-1]}"
+            'display': f"{icon} {action} {repo_short}"
         })
     
     return processed_events
 
-def generate_contribution_summary(contrib_data: Dict) -> Dict[str, Any]:
-    """Generate contribution summary statistics"""
-    if not contrib_data:
-        return {
-            'total_contributions': 0,
-            'current_streak': 0,
-            'longest_streak': 0,
-            'best_day': None,
-            'recent_activity': []
-        }
+def generate_contribution_summary(contributions: Iterable[Dict],
+                                  total_contributions: int = 0) -> Dict[str, Any]:
+    """Generate contribution summary statistics
     
-    contributions = contrib_data.get('contributions', [])
-    total_contributions = contrib_data.get('totalContributions', 0)
-    
-    # Calculate streaks (simplified)
-    current_streak = 0
+    Takes the days (oldest first) in a single pass, so contributions may be a stream.
+    """
+    # Streaks of consecutive days with contributions, up to today
+    today = datetime.utcnow().date().isoformat()
     longest_streak = 0
-    temp_streak = 0
-    
-    # Get recent contributions (last 84 days for 12x7 grid)
-    recent_contribs = contributions[-84:] if len(contributions) >= 84 else contributions
+    streak = 0
     
-    # Find best contribution day
-    best_day = max(contributions, key=lambda x: x.get('contributionCount', 0)) if contributions else None
+    # Recent contributions (last 84 days for 12x7 grid) and the best day
+    recent_contribs = deque(maxlen=84)
+    best_day = None
+    best_count = -1
+    for day in contributions:
+        recent_contribs.append(day)
+        count = day.get('contributionCount', 0)
+        if count > best_count:
+            best_day, best_count = day, count
+        
+        # The calendar can run past today; an empty today doesn't break the streak yet
+        date = day.get('date', '')
+        if date > today:
+            continue
+        if count > 0:
+            streak += 1
+            longest_streak = max(longest_streak, streak)
+        elif date != today:
+            streak = 0
     
     return {
         'total_contributions': total_contributions,
-        'current_streak': current_streak,
+        'current_streak': streak,
         'longest_streak': longest_streak,
         'best_day': {
             'date': best_day.get('date'),
-            'count': best_day.get('contributionCount', 0)
+            'count': best_count
         } if best_day else None,
-        'recent_activity': recent_contribs
+        'recent_activity': list(recent_contribs)
     }
 
+def iter_contribution_days(stream, totals: Dict[str, Any]) -> Iterator[Dict]:
+    """Yield the contributions items of a streamed JSON body one day at a time
+    
+    totalContributions is stored in totals when the parser passes it.
+    """
+    builder = None
+    for prefix, event, value in ijson.parse(stream):
+        if prefix == 'contributions.item':
+            if event == 'start_map':
+                builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            if event == 'end_map':
+                yield builder.value
+                builder = None
+        elif builder is not None:
+            builder.event(event, value)
+        elif prefix == 'totalContributions':
+            totals['totalContributions'] = value
+
+def read_contributions(response) -> Dict[str, Any]:
+    """Summarize a contributions response, straight off the wire when ijson is installed"""
+    if not ijson:
+        contrib_data = response.json()
+        return generate_contribution_summary(contrib_data.get('contributions', []),
+                                             contrib_data.get('totalContributions', 0))
+    
+    response.raw.decode_content = True
+    totals = {}
+    # The summary exhausts the parser, so a total after the calendar is seen too
+    summary = generate_contribution_summary(iter_contribution_days(response.raw, totals))
+    summary['total_contributions'] = totals.get('totalContributions', 0)
+    return summary
+
 def generate_compact_data():
     """Generate compact data optimized for Badger 2040 W"""
     print("=== Generating GitHub Badge Data ===")
     
-    # Fetch all data
-    user_data = fetch_github_data(USER_URL, "user profile")
-    repos_data = fetch_github_data(REPOS_URL, "repositories")
-    events_data = fetch_github_data(EVENTS_URL, "recent events")
-    contrib_data = fetch_github_data(CONTRIB_URL, "contributions")
+    # Fetch all data; the requests are independent, so issue them concurrently
+    load_http_cache()
+    jobs = (
+        (USER_URL, "user profile"),
+        (REPOS_URL, "repositories"),
+        (EVENTS_URL, "recent events"),
+        (CONTRIB_URL, "contributions", read_contributions),
+    )
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        user_data, repos_data, events_data, contrib_data = executor.map(
+            lambda job: fetch_github_data(*job), jobs)
+    save_http_cache()
     
     # Process repositories
     repos_list = repos_data if isinstance(repos_data, list) else []
@@ -209,8 +357,8 @@ def generate_compact_data():
     events_list = events_data if isinstance(events_data, list) else []
     activity = process_activity_events(events_list)
     
-    # Process contributions
-    contrib_summary = generate_contribution_summary(contrib_data)
+    # Contributions are summarized while they download
+    contrib_summary = contrib_data or generate_contribution_summary([])
     
     # Generate timestamp
     timestamp = datetime.utcnow().isoformat() + 'Z'
@@ -264,7 +412,8 @@ def generate_compact_data():
             'stats': {
                 'total_stars': repo_stats['total_stars'],
                 'total_forks': repo_stats['total_forks'],
-                'languages': dict(list(repo_stats['languages'].items())[:5]),
+                # Already most frequent first, so the top five are the first five
+                'languages': dict(islice(repo_stats['languages'].items(), 5)),
                 'most_starred': repo_stats['most_starred']
             },
             'activity': activity[:5],
@@ -278,31 +427,46 @@ def generate_compact_data():
     
     # Save to both data and public directories
     for filename, data in files_to_save.items():
-        # Save to data directory (for repository)
-        with open(f'{OUTPUT_DIR}/{filename}', 'w') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        # Save to public directory (for GitHub Pages)
-        with open(f'{PUBLIC_DIR}/api/{filename}', 'w') as f:
-            json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        save_json(filename, data)
+    
+    # Binary copy of the compact payload for badges with a MessagePack decoder
+    if msgpack:
+        write_if_changed(f'{PUBLIC_DIR}/api/badge_compact.msgpack',
+                         msgpack.packb(files_to_save['badge_compact.json']))
+    else:
+        print("msgpack not installed, skipping badge_compact.msgpack")
+    
+    # Fixed-layout binary summary: six little-endian uint32s, then name and username bytes
+    name_bytes = (profile_data['name'] or '').encode('utf-8')
+    user_bytes = profile_data['username'].encode('utf-8')
+    packed = struct.pack('<IIIIII',
+                         profile_data['public_repos'],
+                         profile_data['followers'],
+                         repo_stats['total_stars'],
+                         repo_stats['total_forks'],
+                         len(name_bytes),
+                         len(user_bytes))
+    write_if_changed(f'{PUBLIC_DIR}/api/badge_packed.bin', packed + name_bytes + user_bytes)
     
     # Generate simple text files for basic consumption
-    with open(f'{PUBLIC_DIR}/api/badge_simple.txt', 'w') as f:
-        f.write(f"{profile_data['username']}\n")
-        f.write(f"{profile_data['name']}\n")
-        f.write(f"{profile_data['public_repos']}\n")
-        f.write(f"{profile_data['followers']}\n")
-        f.write(f"{profile_data['following']}\n")
-        f.write(f"{repo_stats['total_stars']}\n")
-        f.write(f"{repo_stats['total_forks']}\n")
-        f.write(f"{list(repo_stats['languages'].keys())[0] if repo_stats['languages'] else 'None'}\n")
-        f.write(f"{repo_stats['most_starred']['name'] if repo_stats['most_starred'] else 'None'}\n")
-        f.write(f"{timestamp}\n")
+    simple_lines = (
+        profile_data['username'],
+        profile_data['name'],
+        profile_data['public_repos'],
+        profile_data['followers'],
+        profile_data['following'],
+        repo_stats['total_stars'],
+        repo_stats['total_forks'],
+        next(iter(repo_stats['languages']), 'None'),
+        repo_stats['most_starred']['name'] if repo_stats['most_starred'] else 'None',
+        timestamp,
+    )
+    save_public('badge_simple.txt', ''.join(f"{line}\n" for line in simple_lines).encode('utf-8'))
     
     print(f"\n=== Data Generation Complete ===")
     print(f"Profile: {profile_data['name']} (@{profile_data['username']})")
     print(f"Repos: {repo_stats['total_repos']} ({repo_stats['total_stars']} stars)")
-    print(f"Languages: {', '.join(list(repo_stats['languages'].keys())[:3])}")
+    print(f"Languages: {', '.join(islice(repo_stats['languages'], 3))}")
     print(f"Recent activity: {len(activity)} events")
     print(f"Generated at: {timestamp}")
     
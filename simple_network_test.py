@@ -6,6 +6,16 @@ Simple network connectivity test for Badger 2040 W
 import network
 import time
 import urequests
+from micropython import const
+
+# Built once at import rather than on every run
+TEST_URLS = (
+    "http://httpbin.org/ip",
+    "http://192.168.4.214:8080/api/badge_simple.txt",
+    "http://192.168.4.214:8080/api/badge_compact.json"
+)
+TIMEOUT_S = const(10)
+PREVIEW_CHARS = const(100)
 
 def test_network_simple():
     """Test basic network connectivity"""
@@ -30,21 +40,15 @@ def test_network_simple():
     print(f"🌐 Gateway: {gateway}")
     
     # Test basic connectivity
-    test_urls = [
-        "http://httpbin.org/ip",
-        "http://192.168.4.214:8080/api/badge_simple.txt",
-        "http://192.168.4.214:8080/api/badge_compact.json"
-    ]
-    
-    for url in test_urls:
+    for url in TEST_URLS:
         print(f"\n🔗 Testing: {url}")
         try:
-            response = urequests.get(url, timeout=10)
+            response = urequests.get(url, timeout=TIMEOUT_S)
             print(f"   ✅ Status: {response.status_code}")
             
             content = response.text
-            if len(content) > 100:
-                content = content[:100] + "..."
+            if len(content) > PREVIEW_CHARS:
+                content = content[:PREVIEW_CHARS] + "..."
             print(f"   📄 Content: {content}")
             
             response.close()
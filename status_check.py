@@ -4,7 +4,7 @@ Simple status check for Badger 2040 W
 """
 
 import badger2040
-import time
+import machine
 
 # Quick status display
 display = badger2040.Badger2040()
@@ -31,13 +31,25 @@ print("Status check displayed")
 print("Badge should show status screen")
 print("Press any button on device to continue")
 
-# Wait for button press
-while True:
-    if (display.pressed(badger2040.BUTTON_A) or 
-        display.pressed(badger2040.BUTTON_B) or 
-        display.pressed(badger2040.BUTTON_C)):
-        break
-    time.sleep(0.1)
+# Wait for button press, asleep between presses; the IRQ wakes lightsleep
+pressed = False
+
+def on_press(pin):
+    global pressed
+    pressed = True
+
+buttons = [machine.Pin(gpio, machine.Pin.IN, machine.Pin.PULL_DOWN)
+           for gpio in (badger2040.BUTTON_A, badger2040.BUTTON_B, badger2040.BUTTON_C)]
+for pin in buttons:
+    # Buttons are active high
+    pin.irq(trigger=machine.Pin.IRQ_RISING, handler=on_press)
+
+while not pressed and not any(pin.value() for pin in buttons):
+    # Capped so a press landing just before the sleep is still seen within a second
+    machine.lightsleep(1000)
+
+for pin in buttons:
+    pin.irq(handler=None)
 
 print("Button pressed - returning to badge application")
 
@@ -4,36 +4,20 @@ Test WiFi connectivity and badge functionality on Badger 2040 W
 """
 
 import serial
-import time
 import sys
-import glob
-from typing import Optional
-
-def find_pico_device() -> Optional[str]:
-    """Find connected Pico device"""
-    patterns = [
-        '/dev/tty.usbmodem*',
-        '/dev/ttyACM*', 
-        '/dev/ttyUSB*'
-    ]
-    
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+from badge_serial import find_device, open_repl, send_ctrl_c
 
 def send_command(ser: serial.Serial, command: str, wait_time: float = 2.0) -> str:
-    """Send command and return response"""
+    """Send command and return its output, up to the next prompt or wait_time seconds"""
     # Clear any pending input
     ser.reset_input_buffer()
     
-    # Send command
-    ser.write((command + '\r\n').encode())
-    time.sleep(wait_time)
+    # Send command; a leading blank line would bring a prompt back before it runs
+    ser.write((command.lstrip('\n') + '\r\n').encode())
     
-    # Read response
-    response = ser.read_all().decode('utf-8', errors='ignore')
+    # Read response, returning as soon as the REPL is ready again
+    ser.timeout = wait_time
+    response = ser.read_until(b'>>> ').decode('utf-8', errors='ignore')
     return response
 
 def test_wifi_connection(device_path: str) -> bool:
@@ -42,11 +26,10 @@ def test_wifi_connection(device_path: str) -> bool:
         print("🌐 Testing WiFi Connection...")
         print("============================")
         
-        ser = serial.Serial(device_path, 115200, timeout=10)
+        ser = open_repl(device_path, timeout=10)
         
         # Send Ctrl+C to interrupt any running program
-        ser.write(b'\x03')
-        time.sleep(1)
+        send_ctrl_c(ser, timeout=1.0)
         
         # Test basic REPL
         response = send_command(ser, "", 0.5)
@@ -135,11 +118,10 @@ def test_badge_display(device_path: str) -> bool:
         print("\n🦡 Testing Badge Display...")
         print("===========================")
         
-        ser = serial.Serial(device_path, 115200, timeout=10)
+        ser = open_repl(device_path, timeout=10)
         
         # Send Ctrl+C to interrupt any running program
-        ser.write(b'\x03')
-        time.sleep(1)
+        send_ctrl_c(ser, timeout=1.0)
         
         # Test display initialization
         print("📺 Testing display...")
@@ -194,7 +176,7 @@ def main():
     print("==========================================")
     
     # Find device
-    device = find_pico_device()
+    device = find_device()
     if not device:
         print("❌ No Pico device found")
         print("   Make sure device is connected and not in bootloader mode")
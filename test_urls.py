@@ -6,22 +6,34 @@ Test GitHub Pages URLs for the badge application
 import network
 import urequests
 import time
+from micropython import const
+
+USERNAME = "Julian-Elliott"
+REPO = "badger-github-badge"
+
+# Built once at import rather than on every run
+URLS_TO_TEST = (
+    f"https://{USERNAME}.github.io/{REPO}/api/badge_compact.json",
+    f"https://{USERNAME}.github.io/{REPO}/api/badge_simple.txt",
+    f"https://{USERNAME}.github.io/{REPO}/",
+    "https://api.github.com/rate_limit",
+    f"https://api.github.com/users/{USERNAME}"
+)
+
+# Bytes of each body to preview; only these are requested and read
+PREVIEW_BYTES = const(256)
+TIMEOUT_S = const(15)
+
+HEADERS = {
+    'User-Agent': 'BadgerGitHubBadge/1.0',
+    'Accept': 'application/json',
+    'Range': f'bytes=0-{PREVIEW_BYTES - 1}'
+}
 
 def test_github_pages():
     """Test GitHub Pages URLs"""
     print("=== GitHub Pages URL Test ===")
     
-    username = "Julian-Elliott"
-    repo = "badger-github-badge"
-    
-    urls_to_test = [
-        f"https://{username}.github.io/{repo}/api/badge_compact.json",
-        f"https://{username}.github.io/{repo}/api/badge_simple.txt",
-        f"https://{username}.github.io/{repo}/",
-        "https://api.github.com/rate_limit",
-        "https://api.github.com/users/Julian-Elliott"
-    ]
-    
     sta = network.WLAN(network.STA_IF)
     if not sta.isconnected():
         print("❌ WiFi not connected")
@@ -29,19 +41,15 @@ def test_github_pages():
     
     print(f"📡 IP: {sta.ifconfig()[0]}")
     
-    headers = {
-        'User-Agent': 'BadgerGitHubBadge/1.0',
-        'Accept': 'application/json'
-    }
-    
-    for url in urls_to_test:
+    for url in URLS_TO_TEST:
         print(f"\n🔗 Testing: {url}")
         try:
-            response = urequests.get(url, headers=headers, timeout=15)
+            response = urequests.get(url, headers=HEADERS, timeout=TIMEOUT_S)
             print(f"   Status: {response.status_code}")
             
-            if response.status_code == 200:
-                content = response.text
+            # Servers that ignore Range send the whole body; read only the preview of it
+            if response.status_code in (200, 206):
+                content = response.raw.read(PREVIEW_BYTES).decode('utf-8', 'ignore')
                 if len(content) > 200:
                     content = content[:200] + "..."
                 print(f"   Content preview: {content}")
@@ -50,7 +58,7 @@ def test_github_pages():
             elif response.status_code == 403:
                 print("   ❌ Forbidden - possible rate limit")
             else:
-                print(f"   ⚠️  Unexpected status: {response.text[:100]}")
+                print(f"   ⚠️  Unexpected status: {response.raw.read(100).decode('utf-8', 'ignore')}")
             
             response.close()
             
@@ -4,20 +4,9 @@ Upload single file to Badger 2040 W and run it
 """
 
 import sys
-import serial
 import time
-import glob
 import os
-
-def find_device():
-    """Find connected Pico device"""
-    patterns = ['/dev/tty.usbmodem*', '/dev/ttyACM*', '/dev/ttyUSB*']
-    
-    for pattern in patterns:
-        devices = glob.glob(pattern)
-        if devices:
-            return devices[0]
-    return None
+from badge_serial import find_device, open_raw_repl, exec_raw
 
 def upload_and_run(filename, run_as_main=True):
     """Upload a file and optionally run it"""
@@ -35,29 +24,17 @@ def upload_and_run(filename, run_as_main=True):
     
     try:
         # Read file content
-        with open(filename, 'r') as f:
+        with open(filename, 'rb') as f:
             content = f.read()
         
-        # Connect to device
-        ser = serial.Serial(device, 115200, timeout=5)
-        time.sleep(0.5)
+        # Connect to device, interrupting any running program
+        ser = open_raw_repl(device)
+        if not ser:
+            return False
         
-        # Send Ctrl+C to interrupt any running program
-        ser.write(b'\x03')
-        time.sleep(0.5)
-        ser.read_all()  # Clear buffer
-        
-        # Upload file by pasting content
+        # Send the whole file in one raw-paste transfer; the device paces it
         print("📤 Uploading file content...")
-        
-        # Send the file content line by line
-        lines = content.split('\n')
-        for i, line in enumerate(lines):
-            if i % 50 == 0:
-                print(f"   Progress: {i}/{len(lines)} lines")
-            
-            ser.write((line + '\r\n').encode())
-            time.sleep(0.02)  # Small delay between lines
+        exec_raw(ser, content)
         
         if run_as_main:
             print("🚀 Running application...")
@@ -70,13 +47,16 @@ def upload_and_run(filename, run_as_main=True):
             if ser.in_waiting > 0:
                 data = ser.read(ser.in_waiting)
                 try:
-                    text = data.decode('utf-8', errors='ignore')
+                    # Raw REPL ends stdout and stderr with Ctrl+D
+                    text = data.decode('utf-8', errors='ignore').replace('\x04', '\n')
                     if text.strip():
                         print(f"📱 Device: {text.strip()}")
                 except:
                     pass
             time.sleep(0.1)
         
+        # Back to the normal REPL if the program has finished
+        ser.write(b'\x02')
         ser.close()
         print("✅ Upload complete")
         return True